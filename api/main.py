@@ -17,10 +17,25 @@ async def startup_event():
 
     # Add columns that may not exist in older deployments (idempotent)
     from sqlalchemy import text
+    from models.event import SEARCH_VECTOR_SQL
+    from utils.stats_rollup import CREATE_STATS_ROLLUP_SQL, CREATE_STATS_ROLLUP_INDEX_SQL
     migrations = [
         "ALTER TABLE events ADD COLUMN IF NOT EXISTS organizer_id VARCHAR",
         "ALTER TABLE events ADD COLUMN IF NOT EXISTS organizer_email VARCHAR",
         "CREATE INDEX IF NOT EXISTS ix_events_organizer_id ON events (organizer_id)",
+        "CREATE INDEX IF NOT EXISTS ix_events_start_at_id ON events (start_at, id)",
+        f"ALTER TABLE events ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS ({SEARCH_VECTOR_SQL}) STORED",
+        "CREATE INDEX IF NOT EXISTS ix_events_search_vector ON events USING GIN (search_vector)",
+        "ALTER TABLE events ADD COLUMN IF NOT EXISTS content_hash VARCHAR",
+        "ALTER TABLE events ADD COLUMN IF NOT EXISTS edited_at TIMESTAMPTZ",
+        "ALTER TABLE events ADD COLUMN IF NOT EXISTS image_variants JSON",
+        "ALTER TABLE events ADD COLUMN IF NOT EXISTS duplicate_of_id INTEGER REFERENCES events(id) ON DELETE SET NULL",
+        "CREATE INDEX IF NOT EXISTS ix_events_duplicate_of_id ON events (duplicate_of_id)",
+        "ALTER TABLE tasks ADD COLUMN IF NOT EXISTS events_changed INTEGER DEFAULT 0",
+        "ALTER TABLE tasks ADD COLUMN IF NOT EXISTS events_unchanged INTEGER DEFAULT 0",
+        "CREATE INDEX IF NOT EXISTS ix_tasks_source_type_created_at ON tasks (source_type, created_at)",
+        CREATE_STATS_ROLLUP_SQL,
+        CREATE_STATS_ROLLUP_INDEX_SQL,
     ]
     try:
         with engine.connect() as conn:
@@ -56,6 +71,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag", "Last-Modified"],
 )
 
 # Include routers
@@ -91,3 +107,8 @@ async def shutdown_event():
         print("✅ Scheduler stopped")
     except:
         pass
+    try:
+        from utils.fid_main_client import close_revalidation
+        await close_revalidation()
+    except Exception as e:
+        print(f"⚠️ fid-main revalidation flush on shutdown failed: {e}")
@@ -1,9 +1,19 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Enum, Numeric, Boolean
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Text, DateTime, Enum, Numeric, Boolean, Index, Computed, JSON, ForeignKey
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import relationship, deferred
 from sqlalchemy.sql import func
 from database import Base
 import enum
 
+# Weighted full-text document: title (A) > venue (B) > description (C).
+# Stored generated column, so Postgres keeps it current on every write
+# (API, worker bulk upserts and ad-hoc scripts alike).
+SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(venue, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'C')"
+)
+
 class EventStatus(str, enum.Enum):
     DRAFT = "DRAFT"
     PUBLISHED = "PUBLISHED"
@@ -32,6 +42,11 @@ class PriceTier(str, enum.Enum):
 
 class Event(Base):
     __tablename__ = "events"
+    __table_args__ = (
+        # Keyset pagination on GET /api/events orders and seeks by (start_at, id)
+        Index("ix_events_start_at_id", "start_at", "id"),
+        Index("ix_events_search_vector", "search_vector", postgresql_using="gin"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, nullable=False, index=True)
@@ -44,11 +59,16 @@ class Event(Base):
     price_tier = Column(Enum(PriceTier), default=PriceTier.FREE)
     price_amount = Column(Numeric(10, 2))
     image_url = Column(String)
+    image_variants = Column(JSON)  # {"webp": {"480": url, ...}, "avif": {...}} set by the worker's image stage
     source_url = Column(String, nullable=False)
     source_type = Column(String, nullable=False)
     category = Column(String, index=True)
     fid_hash = Column(String, unique=True, index=True, nullable=False)
+    content_hash = Column(String)  # Fingerprint of the extracted source data (set by the worker)
+    edited_at = Column(DateTime(timezone=True))  # Last CMS edit of its content; re-crawls leave edited rows alone
     status = Column(String, default="DRAFT", nullable=False, index=True)
+    # Set when this row is a cross-source duplicate of an older event (see utils/dedup.py)
+    duplicate_of_id = Column(Integer, ForeignKey("events.id", ondelete="SET NULL"), index=True)
     wp_post_id = Column(Integer)
     
     # Organizer portal fields
@@ -60,6 +80,9 @@ class Event(Base):
     featured_tier = Column(String(20))
     featured_until = Column(DateTime(timezone=True))
     
+    # Full-text search (search_mode=fulltext); deferred so listings don't load it
+    search_vector = deferred(Column(TSVECTOR, Computed(SEARCH_VECTOR_SQL, persisted=True)))
+    
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Enum
+from sqlalchemy import Column, Integer, String, Text, DateTime, Enum, Index
 from sqlalchemy.sql import func
 from database import Base
 import enum
@@ -22,6 +22,10 @@ class SourceType(str, enum.Enum):
 
 class Task(Base):
     __tablename__ = "tasks"
+    __table_args__ = (
+        # Sync status reads each source's latest tasks (PARTITION BY source_type ORDER BY created_at DESC)
+        Index("ix_tasks_source_type_created_at", "source_type", "created_at"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     url = Column(String, nullable=False)
@@ -30,6 +34,9 @@ class Task(Base):
     logs = Column(Text)
     error_message = Column(Text)
     events_extracted = Column(Integer, default=0)
+    # Crawl fingerprint outcome: events that were new/updated vs. identical to the last run
+    events_changed = Column(Integer, default=0)
+    events_unchanged = Column(Integer, default=0)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     completed_at = Column(DateTime(timezone=True))
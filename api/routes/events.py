@@ -1,50 +1,54 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, Body
+from fastapi import APIRouter, Depends, HTTPException, Query, Body, Request, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from sqlalchemy import or_, and_
-from typing import List, Optional
+from sqlalchemy import or_, and_, tuple_, func, select, update
+from typing import List, Optional, Literal, Union
 from datetime import datetime
 from pydantic import BaseModel
 import hashlib
-from database import get_db
+import re
+from database import get_db, SessionLocal
 from models.event import Event
 from models.user import User
-from schemas.event import EventResponse, EventUpdate, EventCreate
+from schemas.event import EventResponse, EventCardResponse, EventUpdate, EventCreate
 from utils.auth import get_current_user
+from utils.pagination import encode_cursor, decode_cursor
+from utils.dedup import duplicates_of, link_new_events, rescan_duplicates
+from utils.cache import (
+    get_cached_response, cache_response, invalidate_event_cache,
+    event_validators, not_modified_response,
+)
 
 class BulkEventIds(BaseModel):
     event_ids: List[int]
 
 router = APIRouter()
 
-@router.get("/", response_model=List[EventResponse])
-async def list_events(
-    status: Optional[str] = None,
-    city: Optional[str] = None,
-    category: Optional[str] = None,
-    price_tier: Optional[str] = None,
-    start_date: Optional[str] = None,
-    end_date: Optional[str] = None,
-    search: Optional[str] = None,
-    include_past: bool = False,  # New parameter to include past events
-    limit: int = Query(2000, le=5000),  # Increased for large event lists
-    offset: int = 0,
-    db: Session = Depends(get_db)
-):
-    query = db.query(Event)
-    
+def _prefix_tsquery(search: str):
+    """Build an AND-of-prefixes tsquery ("jazz fest" -> jazz:* & fest:*), or None if no words"""
+    words = re.findall(r"\w+", search.lower())
+    if not words:
+        return None
+    return func.to_tsquery("english", " & ".join(f"{w}:*" for w in words))
+
+def _dallas_start_of_today() -> datetime:
+    """Midnight today in Dallas time (Central Time)"""
+    import pytz
+    dallas_now = datetime.now(pytz.timezone('America/Chicago'))
+    return dallas_now.replace(hour=0, minute=0, second=0, microsecond=0)
+
+def _filter_events(query, start_of_today, include_past, status, city, category,
+                   price_tier, start_date, end_date, include_duplicates=False):
+    """Apply the list/export filters shared by list_events and export_events"""
     # AUTOMATICALLY exclude past events (keep today's events in Dallas time)
     if not include_past:
-        from datetime import datetime, timezone
-        import pytz
-        
-        # Get start of today in Dallas time (Central Time)
-        dallas_tz = pytz.timezone('America/Chicago')
-        dallas_now = datetime.now(dallas_tz)
-        start_of_today = dallas_now.replace(hour=0, minute=0, second=0, microsecond=0)
-        
         # Show events from today onwards
         query = query.filter(Event.start_at >= start_of_today)
     
+    # Cross-source duplicates are linked to their canonical event, not listed twice
+    if not include_duplicates:
+        query = query.filter(Event.duplicate_of_id.is_(None))
+    
     # Apply filters
     if status:
         query = query.filter(Event.status == status)
@@ -58,7 +62,78 @@ async def list_events(
         query = query.filter(Event.start_at >= datetime.fromisoformat(start_date.replace('Z', '+00:00')))
     if end_date:
         query = query.filter(Event.start_at <= datetime.fromisoformat(end_date.replace('Z', '+00:00')))
-    if search:
+    return query
+
+# Only these columns are read for view=card
+EVENT_CARD_COLUMNS = [getattr(Event, field) for field in EventCardResponse.model_fields]
+
+@router.get("/", response_model=Union[List[EventResponse], List[EventCardResponse]])
+async def list_events(
+    request: Request,
+    status: Optional[str] = None,
+    city: Optional[str] = None,
+    category: Optional[str] = None,
+    price_tier: Optional[str] = None,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    search: Optional[str] = None,
+    search_mode: Literal["contains", "fulltext"] = "contains",
+    include_past: bool = False,  # New parameter to include past events
+    include_duplicates: bool = False,  # Also list events linked as cross-source duplicates
+    limit: int = Query(2000, le=5000),  # Increased for large event lists
+    offset: int = 0,
+    cursor: Optional[str] = None,  # Keyset pagination - pass back X-Next-Cursor
+    view: Literal["full", "card"] = "full",
+    db: Session = Depends(get_db)
+):
+    """
+    List events ordered by (start_at, id).
+
+    Page with `cursor` instead of `offset` for constant-cost deep pages: every
+    full page sets an X-Next-Cursor header; send it back as `cursor` to get the
+    next page. The header is absent on the last page.
+
+    `search_mode=fulltext` matches `search` against the GIN-indexed
+    search_vector (every word, prefix-matched) and orders by relevance;
+    the default `contains` keeps the substring ILIKE behaviour. Ranked
+    results page with `offset` only, so they never set X-Next-Cursor.
+
+    Responses carry a strong ETag and Last-Modified; a matching
+    If-None-Match / If-Modified-Since gets a 304 without any DB work.
+
+    `view=card` returns EventCardResponse rows (title, dates, venue, city,
+    image, price, category) selected column-by-column in SQL - no
+    description or admin fields are read or sent.
+
+    Events linked to an older copy from another source (duplicate_of_id
+    set) are hidden unless `include_duplicates=true`.
+    """
+    start_of_today = _dallas_start_of_today()
+    
+    # "Today" changes the result set even when no event does
+    cache_params = {**request.query_params, "_today": start_of_today.date().isoformat()}
+    
+    validators = event_validators("events", cache_params)
+    not_modified = not_modified_response(request, validators)
+    if not_modified:
+        return not_modified
+    
+    cached = get_cached_response("events", cache_params, validators)
+    if cached:
+        return cached
+    
+    query = _filter_events(
+        db.query(*EVENT_CARD_COLUMNS) if view == "card" else db.query(Event),
+        start_of_today, include_past,
+        status, city, category, price_tier, start_date, end_date, include_duplicates,
+    )
+    ts_query = None
+    if search and search_mode == "fulltext":
+        ts_query = _prefix_tsquery(search)
+        if ts_query is None:
+            return []
+        query = query.filter(Event.search_vector.op("@@")(ts_query))
+    elif search:
         query = query.filter(
             or_(
                 Event.title.ilike(f"%{search}%"),
@@ -67,13 +142,91 @@ async def list_events(
             )
         )
     
-    # Order by start date (upcoming events first - closest dates at top)
-    query = query.order_by(Event.start_at.asc())
+    if ts_query is not None and cursor:
+        raise HTTPException(status_code=400, detail="cursor is not supported with search_mode=fulltext; use offset")
+    
+    # Keyset pagination: rows strictly after the cursor's (start_at, id)
+    if cursor:
+        cursor_start_at, cursor_id = decode_cursor(cursor)
+        query = query.filter(tuple_(Event.start_at, Event.id) > tuple_(cursor_start_at, cursor_id))
+    
+    # Order by start date (upcoming events first - closest dates at top);
+    # id breaks ties so cursor pages never skip or repeat rows
+    if ts_query is not None:
+        query = query.order_by(func.ts_rank_cd(Event.search_vector, ts_query).desc(), Event.start_at.asc(), Event.id.asc())
+    else:
+        query = query.order_by(Event.start_at.asc(), Event.id.asc())
     
     # Pagination
-    events = query.offset(offset).limit(limit).all()
+    if not cursor:
+        query = query.offset(offset)
+    events = query.limit(limit).all()
+    
+    headers = dict(validators)
+    # Ranked fulltext pages are offset-paged (see the cursor check above)
+    if ts_query is None and events and len(events) == limit:
+        last = events[-1]
+        headers["X-Next-Cursor"] = encode_cursor(last.start_at, last.id)
     
-    return [EventResponse.model_validate(event) for event in events]
+    if view == "card":
+        payload = [EventCardResponse.model_validate(row._mapping) for row in events]
+    else:
+        payload = [EventResponse.model_validate(event) for event in events]
+    
+    return cache_response("events", cache_params, payload, headers)
+
+# Rows fetched per round trip by the export's server-side cursor
+EXPORT_BATCH_SIZE = 500
+
+@router.get("/export")
+async def export_events(
+    status: Optional[str] = None,
+    city: Optional[str] = None,
+    category: Optional[str] = None,
+    price_tier: Optional[str] = None,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    include_past: bool = False,
+    include_duplicates: bool = False,
+    format: Literal["ndjson", "json"] = "ndjson",
+):
+    """
+    Stream every matching event in (start_at, id) order, with no limit.
+
+    Rows come from a server-side cursor (yield_per) and are serialized one at
+    a time, so memory stays flat however large the catalog is. `ndjson`
+    (default) writes one EventResponse object per line; `json` writes the
+    same objects as a single array for clients that need plain JSON.
+    """
+    # Built up front so bad filters fail before streaming starts. A 2.0-style
+    # select: legacy Query uniquing (needed for the JSON column) rules out yield_per
+    statement = _filter_events(
+        select(Event), _dallas_start_of_today(), include_past,
+        status, city, category, price_tier, start_date, end_date, include_duplicates,
+    ).order_by(Event.start_at.asc(), Event.id.asc()).execution_options(yield_per=EXPORT_BATCH_SIZE)
+
+    def rows():
+        # Own session: the request's get_db session is closed before the body streams
+        db = SessionLocal()
+        try:
+            for event in db.scalars(statement):
+                yield EventResponse.model_validate(event).model_dump_json()
+        finally:
+            db.close()
+
+    def ndjson():
+        for row in rows():
+            yield row + "\n"
+
+    def json_array():
+        yield "["
+        for i, row in enumerate(rows()):
+            yield ("," if i else "") + row
+        yield "]"
+
+    if format == "json":
+        return StreamingResponse(json_array(), media_type="application/json")
+    return StreamingResponse(ndjson(), media_type="application/x-ndjson")
 
 @router.post("/", response_model=EventResponse, status_code=201)
 async def create_event(
@@ -126,6 +279,8 @@ async def create_event(
     db.add(new_event)
     db.commit()
     db.refresh(new_event)
+    link_new_events(db, [new_event.id])
+    invalidate_event_cache()
     
     # WordPress push removed post-cutover; api/utils/wordpress.py retained
     # if re-enabling is ever needed.
@@ -139,11 +294,20 @@ async def create_event(
     return EventResponse.model_validate(new_event)
 
 @router.get("/{event_id}", response_model=EventResponse)
-async def get_event(event_id: int, db: Session = Depends(get_db)):
+async def get_event(event_id: int, request: Request, db: Session = Depends(get_db)):
+    validators = event_validators("event", {"id": event_id})
+    not_modified = not_modified_response(request, validators)
+    if not_modified:
+        return not_modified
+    
     event = db.query(Event).filter(Event.id == event_id).first()
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
-    return EventResponse.model_validate(event)
+    return Response(
+        content=EventResponse.model_validate(event).model_dump_json(),
+        media_type="application/json",
+        headers=validators,
+    )
 
 @router.put("/{event_id}", response_model=EventResponse)
 async def update_event(
@@ -158,12 +322,22 @@ async def update_event(
     
     # Update fields
     update_data = event_update.model_dump(exclude_unset=True)
+    if "image_url" in update_data and update_data["image_url"] != event.image_url:
+        # Variants belong to the old image
+        event.image_variants = None
     for field, value in update_data.items():
         setattr(event, field, value)
-    
+    if update_data.keys() - {"status"}:
+        # Curated content: the worker's re-crawls stop overwriting this row
+        event.edited_at = func.now()
+
     db.commit()
     db.refresh(event)
-    
+    if update_data.keys() & {"title", "venue", "start_at", "status"}:
+        link_new_events(db, [event.id])
+        db.refresh(event)
+    invalidate_event_cache()
+
     return EventResponse.model_validate(event)
 
 @router.delete("/{event_id}")
@@ -176,8 +350,13 @@ async def delete_event(
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
     
+    # Its duplicates are unlinked by the FK (ON DELETE SET NULL); re-cluster them
+    orphan_ids = duplicates_of(db, [event_id])
+    
     db.delete(event)
     db.commit()
+    link_new_events(db, orphan_ids)
+    invalidate_event_cache()
     
     return {"message": "Event deleted successfully"}
 
@@ -193,21 +372,28 @@ async def bulk_publish_events(
     if not event_ids:
         raise HTTPException(status_code=400, detail="No event IDs provided")
     
-    events = db.query(Event).filter(Event.id.in_(event_ids)).all()
-    if not events:
+    published = db.execute(
+        update(Event)
+        .where(Event.id.in_(event_ids))
+        .values(status="PUBLISHED")
+        .returning(Event.id, Event.title),
+        execution_options={"synchronize_session": False},
+    ).all()
+    if not published:
         raise HTTPException(status_code=404, detail="No events found")
     
-    published_count = 0
-    for event in events:
-        try:
-            event.status = "PUBLISHED"
-            published_count += 1
-        except Exception as e:
-            print(f"Error publishing event {event.id}: {e}")
-            continue
-    
     db.commit()
+    link_new_events(db, [event.id for event in published])
+    invalidate_event_cache()
+    
+    # One revalidation window for the whole batch
+    try:
+        from utils.fid_main_client import notify_fid_main_events_published
+        await notify_fid_main_events_published((event.id, event.title) for event in published)
+    except Exception as e:
+        print(f"⚠️ fid-main revalidation failed: {e}")
     
+    published_count = len(published)
     return {
         "message": f"Successfully published {published_count} events",
         "published_count": published_count,
@@ -225,8 +411,11 @@ async def bulk_delete_events(
     if not event_ids:
         raise HTTPException(status_code=400, detail="No event IDs provided")
     
+    orphan_ids = duplicates_of(db, event_ids)
     deleted_count = db.query(Event).filter(Event.id.in_(event_ids)).delete(synchronize_session=False)
     db.commit()
+    link_new_events(db, orphan_ids)
+    invalidate_event_cache()
     
     return {
         "message": f"Successfully deleted {deleted_count} events",
@@ -247,6 +436,8 @@ async def publish_event(
     # if re-enabling is ever needed.
     event.status = "PUBLISHED"
     db.commit()
+    link_new_events(db, [event.id])
+    invalidate_event_cache()
 
     try:
         from utils.fid_main_client import notify_fid_main_event_published
@@ -258,13 +449,19 @@ async def publish_event(
 
 @router.get("/cities/list")
 async def list_cities(db: Session = Depends(get_db)):
+    cached = get_cached_response("cities", {})
+    if cached:
+        return cached
     cities = db.query(Event.city).distinct().filter(Event.city.isnot(None)).all()
-    return [city[0] for city in cities if city[0]]
+    return cache_response("cities", {}, [city[0] for city in cities if city[0]])
 
 @router.get("/categories/list")
 async def list_categories(db: Session = Depends(get_db)):
+    cached = get_cached_response("categories", {})
+    if cached:
+        return cached
     categories = db.query(Event.category).distinct().filter(Event.category.isnot(None)).all()
-    return [cat[0] for cat in categories if cat[0]]
+    return cache_response("categories", {}, [cat[0] for cat in categories if cat[0]])
 
 @router.post("/cleanup/past-events")
 async def cleanup_past_events(
@@ -284,15 +481,38 @@ async def cleanup_past_events(
     # Find past events
     past_events = db.query(Event).filter(Event.start_at < cutoff_date).all()
     deleted_count = len(past_events)
+    orphan_ids = duplicates_of(db, [event.id for event in past_events])
     
     # Delete them
     for event in past_events:
         db.delete(event)
     
     db.commit()
+    link_new_events(db, orphan_ids)
+    invalidate_event_cache()
     
     return {
         "message": f"Deleted {deleted_count} past events",
         "deleted_count": deleted_count,
         "cutoff_date": cutoff_date.isoformat()
     }
+
+@router.post("/duplicates/rescan")
+def rescan_duplicate_events(
+    since: Optional[datetime] = Query(None, description="Only rescan events starting at/after this time"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Recompute cross-source duplicate links for every event (or those starting
+    after `since`), e.g. after changing the matching thresholds.
+    Runs in the threadpool - a full-table rescan takes a while.
+    """
+    stats = rescan_duplicates(db, since=since)
+    if stats["changed"]:
+        invalidate_event_cache()
+    
+    return {
+        "message": f"Rescanned {stats['events']} events, {stats['changed']} duplicate links changed",
+        **stats
+    }
@@ -19,6 +19,7 @@ from schemas.featured_slot import (
     AvailableSlot
 )
 from utils.auth import get_current_user
+from utils.cache import get_cached_response, cache_response, invalidate_event_cache
 from models.user import User
 
 router = APIRouter()
@@ -88,6 +89,10 @@ async def calculate_featured_price(
 async def get_active_featured_events(db: Session = Depends(get_db)):
     """Get currently active featured events for display"""
     
+    cached = get_cached_response("featured_active", {})
+    if cached:
+        return cached
+    
     now = datetime.now(timezone.utc)
     
     # Query active featured slots with their events
@@ -118,7 +123,7 @@ async def get_active_featured_events(db: Session = Depends(get_db)):
         FeaturedSlot.slot_position
     ).all()
     
-    return [
+    return cache_response("featured_active", {}, [
         FeaturedEventDisplay(
             slot_id=row.slot_id,
             slot_position=row.slot_position,
@@ -135,7 +140,7 @@ async def get_active_featured_events(db: Session = Depends(get_db)):
             event_price_amount=row.event_price_amount
         )
         for row in featured
-    ]
+    ])
 
 
 @router.get("/availability", response_model=List[AvailableSlot])
@@ -227,6 +232,7 @@ async def create_featured_slot(
     db.add(new_slot)
     db.commit()
     db.refresh(new_slot)
+    invalidate_event_cache()
     
     return new_slot
 
@@ -284,6 +290,7 @@ async def update_featured_slot(
     
     db.commit()
     db.refresh(slot)
+    invalidate_event_cache()
     
     return slot
 
@@ -302,5 +309,6 @@ async def delete_featured_slot(
     
     db.delete(slot)
     db.commit()
+    invalidate_event_cache()
     
     return {"message": "Featured slot deleted successfully"}
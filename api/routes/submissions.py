@@ -7,6 +7,8 @@ from pydantic import BaseModel
 from datetime import datetime
 from database import get_db
 from models.event import Event
+from utils.cache import invalidate_event_cache
+from utils.dedup import link_new_events
 
 router = APIRouter()
 
@@ -117,6 +119,7 @@ async def create_submission(
         db.add(event)
         db.commit()
         db.refresh(event)
+        invalidate_event_cache()
 
         return {
             "id": event.id,
@@ -168,6 +171,8 @@ async def approve_submission(
     event.status = "PUBLISHED"
     db.commit()
     db.refresh(event)
+    link_new_events(db, [event.id])
+    invalidate_event_cache()
     
     # WordPress push removed post-cutover; api/utils/wordpress.py retained
     # if re-enabling is ever needed.
@@ -202,6 +207,8 @@ async def reject_submission(
     event.status = "REJECTED"
     # Note: Add admin_notes field to Event model if you want to store rejection reason
     db.commit()
+    link_new_events(db, [event.id])
+    invalidate_event_cache()
     
     return {
         "message": "Event rejected",
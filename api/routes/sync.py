@@ -1,534 +1,137 @@
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
-from typing import List
-import redis
-import json
+from datetime import datetime, timezone
 from database import get_db
+from models.task import Task
 from models.user import User
 from routes.auth import get_current_user
+from sources import SOURCES, get_source
+from utils.queue import enqueue_source_sync
 
 router = APIRouter()
 
-# Redis connection for task queue
-import os
-REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379")
-redis_client = redis.from_url(REDIS_URL, decode_responses=True)
+# Recent tasks returned per source by GET /status (default)
+SYNC_STATUS_TASKS_PER_SOURCE = 5
+# Duration and success-rate aggregates cover each source's latest N tasks
+SYNC_STATS_WINDOW = 50
 
-@router.post("/eventbrite/dallas")
-async def sync_eventbrite_dallas(
-    background_tasks: BackgroundTasks,
+@router.get("/status")
+async def get_sync_status(
+    limit: int = Query(SYNC_STATUS_TASKS_PER_SOURCE, ge=1, le=SYNC_STATS_WINDOW),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
-    Bulk sync Eventbrite events from Dallas-area organizers
-    """
-    try:
-        # Create a bulk sync task
-        task_data = {
-            "url": "bulk:eventbrite:dallas",
-            "source_type": "eventbrite_bulk",
-            "status": "queued"
-        }
-        
-        # Add to Redis queue
-        task_id = redis_client.incr("task_counter")
-        redis_client.lpush("extraction_queue", json.dumps({
-            "task_id": task_id,
-            **task_data
-        }))
-        
-        # Save task to database
-        from models.task import Task
-        task = Task(
-            url=task_data["url"],
-            source_type=task_data["source_type"],
-            status=task_data["status"]
-        )
-        db.add(task)
-        db.commit()
-        
-        return {
-            "message": "Eventbrite bulk sync started",
-            "task_id": task.id,
-            "status": "queued",
-            "note": "Configure Eventbrite organizers in settings for more events"
-        }
-    
-    except Exception as e:
-        import traceback
-        traceback.print_exc()
-        print(f"Error in sync_eventbrite_dallas: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
+    Get the status of recent bulk sync operations
 
-@router.post("/dallas-arboretum")
-async def sync_dallas_arboretum(
-    background_tasks: BackgroundTasks,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
-):
-    """
-    Sync events from Dallas Arboretum & Botanical Garden
-    Focuses on family-friendly and kids events
+    One round trip for every registered source: the latest `limit` tasks per
+    source; under "stats", success rate and average duration over its last
+    SYNC_STATS_WINDOW tasks; under "freshness", when it last synced
+    successfully and whether that is older than the source's target.
+    Backed by ix_tasks_source_type_created_at.
     """
     try:
-        # Create a sync task
-        task_data = {
-            "url": "bulk:dallas_arboretum",
-            "source_type": "dallas_arboretum_bulk",
-            "status": "queued"
-        }
-        
-        # Add to Redis queue
-        task_id = redis_client.incr("task_counter")
-        redis_client.lpush("extraction_queue", json.dumps({
-            "task_id": task_id,
-            **task_data
-        }))
-        
-        # Save task to database
-        from models.task import Task
-        task = Task(
-            url=task_data["url"],
-            source_type=task_data["source_type"],
-            status=task_data["status"]
-        )
-        db.add(task)
-        db.commit()
-        
-        return {
-            "message": "Dallas Arboretum sync started",
-            "task_id": task.id,
-            "status": "queued",
-            "venue": "Dallas Arboretum & Botanical Garden",
-            "focus": "Family-friendly and kids events",
-            "categories": ["Nature & Gardens", "Family & Kids", "Education", "Holiday"]
-        }
-    
-    except Exception as e:
-        import traceback
-        traceback.print_exc()
-        print(f"Error in sync_dallas_arboretum: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
+        by_task_type = {source.task_source_type: source for source in SOURCES}
 
-@router.post("/klyde-warren-park")
-async def sync_klyde_warren_park(
-    background_tasks: BackgroundTasks,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
-):
-    """
-    Sync events from Klyde Warren Park
-    Focuses on family-friendly and community events
-    """
-    try:
-        # Create a sync task
-        task_data = {
-            "url": "bulk:klyde_warren_park",
-            "source_type": "klyde_warren_park_bulk",
-            "status": "queued"
-        }
-        
-        # Add to Redis queue
-        task_id = redis_client.incr("task_counter")
-        redis_client.lpush("extraction_queue", json.dumps({
-            "task_id": task_id,
-            **task_data
-        }))
-        
-        # Save task to database
-        from models.task import Task
-        task = Task(
-            url=task_data["url"],
-            source_type=task_data["source_type"],
-            status=task_data["status"]
-        )
-        db.add(task)
-        db.commit()
-        
-        return {
-            "message": "Klyde Warren Park sync started",
-            "task_id": task.id,
-            "status": "queued",
-            "venue": "Klyde Warren Park",
-            "focus": "Family-friendly and community events",
-            "categories": ["Music & Concerts", "Movies & Film", "Family & Kids", "Food & Dining", "Arts & Theatre"]
-        }
-    
-    except Exception as e:
-        import traceback
-        traceback.print_exc()
-        print(f"Error in sync_klyde_warren_park: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
+        ranked = select(
+            Task.id, Task.source_type, Task.status, Task.created_at, Task.completed_at, Task.logs,
+            func.row_number().over(
+                partition_by=Task.source_type, order_by=Task.created_at.desc()
+            ).label("rank"),
+            func.max(Task.completed_at).filter(Task.status == "done").over(
+                partition_by=Task.source_type
+            ).label("last_success_at"),
+        ).where(Task.source_type.in_(by_task_type)).subquery("ranked")
 
-@router.post("/perot-museum")
-async def sync_perot_museum(
-    background_tasks: BackgroundTasks,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
-):
-    """Sync events from Perot Museum of Nature and Science"""
-    try:
-        task_data = {
-            "url": "bulk:perot_museum",
-            "source_type": "perot_museum_bulk",
-            "status": "queued"
-        }
-        
-        task_id = redis_client.incr("task_counter")
-        redis_client.lpush("extraction_queue", json.dumps({
-            "task_id": task_id,
-            **task_data
-        }))
-        
-        from models.task import Task
-        task = Task(
-            url=task_data["url"],
-            source_type=task_data["source_type"],
-            status=task_data["status"]
-        )
-        db.add(task)
-        db.commit()
-        
-        return {
-            "message": "Perot Museum sync started",
-            "task_id": task.id,
-            "status": "queued",
-            "venue": "Perot Museum of Nature and Science",
-            "focus": "Educational and science events",
-            "categories": ["Education & Science", "Family & Kids", "Workshops"]
-        }
-    except Exception as e:
-        import traceback
-        traceback.print_exc()
-        raise HTTPException(status_code=500, detail=str(e))
+        # Aggregates over the latest SYNC_STATS_WINDOW tasks of each source
+        finished = ranked.c.status.in_(("done", "failed"))
+        duration = func.extract("epoch", ranked.c.completed_at - ranked.c.created_at)
+        recent = select(
+            ranked,
+            func.count().filter(finished).over(partition_by=ranked.c.source_type).label("finished"),
+            func.count().filter(ranked.c.status == "done").over(partition_by=ranked.c.source_type).label("succeeded"),
+            func.avg(duration).filter(finished).over(partition_by=ranked.c.source_type).label("avg_duration_seconds"),
+            func.max(duration).filter(finished).over(partition_by=ranked.c.source_type).label("max_duration_seconds"),
+        ).where(ranked.c.rank <= SYNC_STATS_WINDOW).subquery("recent")
 
-@router.post("/dallas-library")
-async def sync_dallas_library(
-    background_tasks: BackgroundTasks,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
-):
-    """Sync events from Dallas Public Library"""
-    try:
-        task_data = {
-            "url": "bulk:dallas_library",
-            "source_type": "dallas_library_bulk",
-            "status": "queued"
-        }
-        
-        task_id = redis_client.incr("task_counter")
-        redis_client.lpush("extraction_queue", json.dumps({
-            "task_id": task_id,
-            **task_data
-        }))
-        
-        from models.task import Task
-        task = Task(
-            url=task_data["url"],
-            source_type=task_data["source_type"],
-            status=task_data["status"]
-        )
-        db.add(task)
-        db.commit()
-        
-        return {
-            "message": "Dallas Public Library sync started",
-            "task_id": task.id,
-            "status": "queued",
-            "venue": "Dallas Public Library",
-            "focus": "FREE educational and community events",
-            "categories": ["Reading & Literacy", "Arts & Crafts", "STEM", "Education"]
-        }
-    except Exception as e:
-        import traceback
-        traceback.print_exc()
-        raise HTTPException(status_code=500, detail=str(e))
+        rows = db.execute(
+            select(recent)
+            .where(recent.c.rank <= limit)
+            .order_by(recent.c.source_type, recent.c.rank)
+        ).all()
 
-@router.post("/dallas-zoo")
-async def sync_dallas_zoo(
-    background_tasks: BackgroundTasks,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
-):
-    """Sync events from Dallas Zoo"""
-    try:
-        task_data = {
-            "url": "bulk:dallas_zoo",
-            "source_type": "dallas_zoo_bulk",
-            "status": "queued"
-        }
-        
-        task_id = redis_client.incr("task_counter")
-        redis_client.lpush("extraction_queue", json.dumps({
-            "task_id": task_id,
-            **task_data
-        }))
-        
-        from models.task import Task
-        task = Task(
-            url=task_data["url"],
-            source_type=task_data["source_type"],
-            status=task_data["status"]
-        )
-        db.add(task)
-        db.commit()
-        
-        return {
-            "message": "Dallas Zoo sync started",
-            "task_id": task.id,
-            "status": "queued",
-            "venue": "Dallas Zoo",
-            "focus": "Animal encounters and nature events",
-            "categories": ["Animals & Nature", "Family & Kids", "Education"]
-        }
-    except Exception as e:
-        import traceback
-        traceback.print_exc()
-        raise HTTPException(status_code=500, detail=str(e))
-
-@router.post("/fair-park")
-async def sync_fair_park(
-    background_tasks: BackgroundTasks,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
-):
-    """Sync events from Fair Park"""
-    try:
-        task_data = {
-            "url": "bulk:fair_park",
-            "source_type": "fair_park_bulk",
-            "status": "queued"
-        }
-        
-        task_id = redis_client.incr("task_counter")
-        redis_client.lpush("extraction_queue", json.dumps({
-            "task_id": task_id,
-            **task_data
-        }))
-        
-        from models.task import Task
-        task = Task(
-            url=task_data["url"],
-            source_type=task_data["source_type"],
-            status=task_data["status"]
-        )
-        db.add(task)
-        db.commit()
-        
-        return {
-            "message": "Fair Park sync started",
-            "task_id": task.id,
-            "status": "queued",
-            "venue": "Fair Park",
-            "focus": "Festivals and cultural events",
-            "categories": ["Festivals & Fairs", "Cultural Events", "Music & Concerts", "Sports"]
-        }
-    except Exception as e:
-        import traceback
-        traceback.print_exc()
-        raise HTTPException(status_code=500, detail=str(e))
+        status = {source.name: [] for source in SOURCES}
+        stats = {}
+        last_success = {}
+        for row in rows:
+            source = by_task_type[row.source_type]
+            status[source.name].append({
+                "id": row.id,
+                "status": row.status,
+                "created_at": row.created_at.isoformat(),
+                "completed_at": row.completed_at.isoformat() if row.completed_at else None,
+                "logs": row.logs
+            })
+            last_success[source.name] = row.last_success_at
+            stats[source.name] = {
+                "finished": row.finished,
+                "success_rate": round(row.succeeded / row.finished, 3) if row.finished else None,
+                "avg_duration_seconds": round(float(row.avg_duration_seconds), 1) if row.avg_duration_seconds is not None else None,
+                "max_duration_seconds": round(float(row.max_duration_seconds), 1) if row.max_duration_seconds is not None else None,
+            }
 
-@router.post("/house-of-blues")
-async def sync_house_of_blues(
-    background_tasks: BackgroundTasks,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
-):
-    """Sync events from House of Blues Dallas"""
-    try:
-        task_data = {
-            "url": "bulk:house_of_blues",
-            "source_type": "house_of_blues_bulk",
-            "status": "queued"
-        }
-        
-        task_id = redis_client.incr("task_counter")
-        redis_client.lpush("extraction_queue", json.dumps({
-            "task_id": task_id,
-            **task_data
-        }))
-        
-        from models.task import Task
-        task = Task(
-            url=task_data["url"],
-            source_type=task_data["source_type"],
-            status=task_data["status"]
-        )
-        db.add(task)
-        db.commit()
-        
-        return {
-            "message": "House of Blues Dallas sync started",
-            "task_id": task.id,
-            "status": "queued",
-            "venue": "House of Blues Dallas",
-            "focus": "Live music and entertainment",
-            "categories": ["Music & Performance", "Concerts", "Live Shows"]
-        }
-    except Exception as e:
-        import traceback
-        traceback.print_exc()
-        raise HTTPException(status_code=500, detail=str(e))
+        now = datetime.now(timezone.utc)
+        status["stats"] = {
+            source.name: stats.get(source.name, {
+                "finished": 0, "success_rate": None,
+                "avg_duration_seconds": None, "max_duration_seconds": None,
+            })
+            for source in SOURCES
+        }
+        status["freshness"] = {
+            source.name: {
+                "last_success_at": last_success[source.name].isoformat() if last_success.get(source.name) else None,
+                "target_hours": source.freshness.total_seconds() / 3600,
+                "stale": not last_success.get(source.name) or now - last_success[source.name] > source.freshness,
+            }
+            for source in SOURCES
+        }
+        return status
 
-@router.post("/factory-deep-ellum")
-async def sync_factory_deep_ellum(
-    background_tasks: BackgroundTasks,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
-):
-    """Sync events from The Factory in Deep Ellum"""
-    try:
-        task_data = {
-            "url": "bulk:factory_deep_ellum",
-            "source_type": "factory_deep_ellum_bulk",
-            "status": "queued"
-        }
-        
-        task_id = redis_client.incr("task_counter")
-        redis_client.lpush("extraction_queue", json.dumps({
-            "task_id": task_id,
-            **task_data
-        }))
-        
-        from models.task import Task
-        task = Task(
-            url=task_data["url"],
-            source_type=task_data["source_type"],
-            status=task_data["status"]
-        )
-        db.add(task)
-        db.commit()
-        
-        return {
-            "message": "Factory Deep Ellum sync started",
-            "task_id": task.id,
-            "status": "queued",
-            "venue": "The Factory in Deep Ellum",
-            "focus": "Live music and entertainment",
-            "categories": ["Music & Performance", "Concerts", "Live Shows"]
-        }
     except Exception as e:
         import traceback
         traceback.print_exc()
+        print(f"Error in get_sync_status: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.get("/status")
-async def get_sync_status(
+# Plain def: enqueue_source_sync can block, so FastAPI runs this in the threadpool
+@router.post("/{source_name}")
+def sync_source(
+    source_name: str,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
-    Get the status of recent bulk sync operations
+    Queue a sync of one registered source (see sources.py), e.g.
+    /api/sync/dallas-arboretum
     """
+    source = get_source(source_name)
+    if not source:
+        raise HTTPException(status_code=404, detail=f"Unknown sync source: {source_name}")
+
     try:
-        from models.task import Task
-        from sqlalchemy import desc
-        
-        # Get recent bulk sync tasks
-        eventbrite_tasks = db.query(Task).filter(
-            Task.source_type == "eventbrite_bulk"
-        ).order_by(desc(Task.created_at)).limit(5).all()
-        
-        dallas_arboretum_tasks = db.query(Task).filter(
-            Task.source_type == "dallas_arboretum_bulk"
-        ).order_by(desc(Task.created_at)).limit(5).all()
-        
-        klyde_warren_park_tasks = db.query(Task).filter(
-            Task.source_type == "klyde_warren_park_bulk"
-        ).order_by(desc(Task.created_at)).limit(5).all()
-        
-        perot_museum_tasks = db.query(Task).filter(
-            Task.source_type == "perot_museum_bulk"
-        ).order_by(desc(Task.created_at)).limit(5).all()
-        
-        dallas_library_tasks = db.query(Task).filter(
-            Task.source_type == "dallas_library_bulk"
-        ).order_by(desc(Task.created_at)).limit(5).all()
-        
-        dallas_zoo_tasks = db.query(Task).filter(
-            Task.source_type == "dallas_zoo_bulk"
-        ).order_by(desc(Task.created_at)).limit(5).all()
-        
-        fair_park_tasks = db.query(Task).filter(
-            Task.source_type == "fair_park_bulk"
-        ).order_by(desc(Task.created_at)).limit(5).all()
-        
+        task, created = enqueue_source_sync(db, source)
+
         return {
-            "eventbrite": [
-                {
-                    "id": task.id,
-                    "status": task.status,
-                    "created_at": task.created_at.isoformat(),
-                    "completed_at": task.completed_at.isoformat() if task.completed_at else None,
-                    "logs": task.logs
-                }
-                for task in eventbrite_tasks
-            ],
-            "dallas_arboretum": [
-                {
-                    "id": task.id,
-                    "status": task.status,
-                    "created_at": task.created_at.isoformat(),
-                    "completed_at": task.completed_at.isoformat() if task.completed_at else None,
-                    "logs": task.logs
-                }
-                for task in dallas_arboretum_tasks
-            ],
-            "klyde_warren_park": [
-                {
-                    "id": task.id,
-                    "status": task.status,
-                    "created_at": task.created_at.isoformat(),
-                    "completed_at": task.completed_at.isoformat() if task.completed_at else None,
-                    "logs": task.logs
-                }
-                for task in klyde_warren_park_tasks
-            ],
-            "perot_museum": [
-                {
-                    "id": task.id,
-                    "status": task.status,
-                    "created_at": task.created_at.isoformat(),
-                    "completed_at": task.completed_at.isoformat() if task.completed_at else None,
-                    "logs": task.logs
-                }
-                for task in perot_museum_tasks
-            ],
-            "dallas_library": [
-                {
-                    "id": task.id,
-                    "status": task.status,
-                    "created_at": task.created_at.isoformat(),
-                    "completed_at": task.completed_at.isoformat() if task.completed_at else None,
-                    "logs": task.logs
-                }
-                for task in dallas_library_tasks
-            ],
-            "dallas_zoo": [
-                {
-                    "id": task.id,
-                    "status": task.status,
-                    "created_at": task.created_at.isoformat(),
-                    "completed_at": task.completed_at.isoformat() if task.completed_at else None,
-                    "logs": task.logs
-                }
-                for task in dallas_zoo_tasks
-            ],
-            "fair_park": [
-                {
-                    "id": task.id,
-                    "status": task.status,
-                    "created_at": task.created_at.isoformat(),
-                    "completed_at": task.completed_at.isoformat() if task.completed_at else None,
-                    "logs": task.logs
-                }
-                for task in fair_park_tasks
-            ]
+            "message": f"{source.label} sync started" if created else f"{source.label} sync already {task.status}",
+            "task_id": task.id,
+            "status": task.status,
+            **(source.details or {})
         }
-    
+
     except Exception as e:
         import traceback
         traceback.print_exc()
-        print(f"Error in get_sync_status: {str(e)}")
+        print(f"Error syncing {source.name}: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -6,7 +6,7 @@ from models.task import Task
 from models.user import User
 from schemas.task import TaskCreate, TaskResponse
 from utils.auth import get_current_user
-from utils.queue import queue_extraction_task
+from utils.queue import INTERACTIVE_LANE, enqueue_task
 import re
 
 router = APIRouter()
@@ -26,8 +26,9 @@ def detect_source_type(url: str) -> str:
     else:
         return "webpage"
 
+# Plain def: enqueue_task can block, so FastAPI runs this in the threadpool
 @router.post("/extract", response_model=List[TaskResponse])
-async def create_extraction_tasks(
+def create_extraction_tasks(
     task_data: TaskCreate,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
@@ -38,18 +39,8 @@ async def create_extraction_tasks(
         # Detect source type
         source_type = detect_source_type(url)
         
-        # Create task
-        task = Task(
-            url=url,
-            source_type=source_type,
-            status="queued"
-        )
-        db.add(task)
-        db.commit()
-        db.refresh(task)
-        
-        # Queue for processing
-        await queue_extraction_task(task.id, url, source_type)
+        # Create and queue the task (or reuse the one already queued/running for this URL)
+        task, _ = enqueue_task(db, url, source_type, INTERACTIVE_LANE)
         
         created_tasks.append(TaskResponse.model_validate(task))
     
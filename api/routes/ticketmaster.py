@@ -10,6 +10,8 @@ from database import get_db
 from models import Event, User
 from routes.auth import get_current_user
 from services.ticketmaster import TicketmasterService
+from utils.cache import invalidate_event_cache
+from utils.dedup import link_new_events
 from datetime import datetime
 
 router = APIRouter()
@@ -106,6 +108,8 @@ async def import_ticketmaster_event(
     db.add(new_event)
     db.commit()
     db.refresh(new_event)
+    link_new_events(db, [new_event.id])
+    invalidate_event_cache()
     
     return {
         "message": f"Successfully imported: {new_event.title}",
@@ -144,6 +148,7 @@ async def bulk_import_ticketmaster_events(
     imported_count = 0
     skipped_count = 0
     errors = []
+    imported_ids = []
     
     for tm_event in events:
         try:
@@ -162,11 +167,16 @@ async def bulk_import_ticketmaster_events(
             db.commit()
             
             imported_count += 1
+            imported_ids.append(new_event.id)
             
         except Exception as e:
             errors.append(f"{tm_event.get('name', 'Unknown')}: {str(e)}")
             continue
     
+    if imported_count:
+        link_new_events(db, imported_ids)
+        invalidate_event_cache()
+    
     return {
         "message": f"Bulk import complete",
         "imported": imported_count,
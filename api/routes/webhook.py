@@ -32,6 +32,8 @@ from database import get_db, SessionLocal
 from models.event import Event
 from models.featured_slot import FeaturedSlot
 from pricing import STRIPE_PRODUCT_TAG, FEATURED_PRICE_USD
+from utils.cache import invalidate_event_cache
+from utils.dedup import link_new_events
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -152,6 +154,8 @@ def _handle_checkout_completed(session: dict, db: Session) -> int | None:
             db.add(slot)
 
         db.commit()
+        link_new_events(db, [event_id])
+        invalidate_event_cache()
         logger.info(
             "checkout.session.completed: event_id=%s published; featured=%s plan=%s",
             event_id, featured, plan,
@@ -1,19 +1,27 @@
 """
 Automated Event Sync & Publish Scheduler
-Runs 2x daily: 8 AM and 6 PM Central Time
+Queues source syncs hourly; new events are published as each sync task completes
 """
 
-import os
 import asyncio
 import logging
+import os
+import socket
 from datetime import datetime
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
-import redis
-import json
+import pytz
+import redis.asyncio as aioredis
+from sqlalchemy import select, update
 from sqlalchemy.orm import Session
 from database import SessionLocal
 from models.event import Event
+from sources import SOURCES, Source, scheduled_sources
+from utils.cache import invalidate_event_cache
+from utils.dedup import duplicates_of, link_new_events
+from utils.fid_main_client import flush_revalidations, notify_fid_main_events_published
+from utils.queue import BACKFILL_LANE, SCHEDULED_LANE, enqueue_source_sync
+from utils.stats_rollup import refresh_stats_rollup
 # WordPress push removed post-cutover; api/utils/wordpress.py retained
 # if re-enabling is ever needed.
 
@@ -24,78 +32,105 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Redis connection
+# Event sources and their schedules live in the source registry (sources.py)
+DALLAS_TZ = pytz.timezone('America/Chicago')
+
+# Worker task-completion stream (must match worker/worker.py)
 REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379")
-redis_client = redis.from_url(REDIS_URL, decode_responses=True)
-
-# Event sources to sync
-EVENT_SOURCES = [
-    {"name": "Eventbrite Dallas", "type": "eventbrite_bulk", "url": "bulk:eventbrite:dallas"},
-    {"name": "Dallas Arboretum", "type": "dallas_arboretum", "url": "https://www.dallasarboretum.org/events-activities/"},
-    {"name": "Klyde Warren Park", "type": "klyde_warren", "url": "https://www.klydewarrenpark.org/things-to-do/events.html"},
-    {"name": "Perot Museum", "type": "perot_museum", "url": "https://www.perotmuseum.org/explore-the-museum/calendar/index.html"},
-    {"name": "Dallas Library", "type": "dallas_library", "url": "https://dallaslibrary2.org/events/"},
-    {"name": "Dallas Zoo", "type": "dallas_zoo", "url": "https://www.dallaszoo.com/events/"},
-    {"name": "Fair Park", "type": "fair_park", "url": "https://fairpark.org/events/"},
-    {"name": "House of Blues", "type": "house_of_blues", "url": "https://www.houseofblues.com/dallas"},
-    {"name": "Factory Deep Ellum", "type": "factory_deep_ellum", "url": "https://www.factorydeepellum.com/events"},
-]
-
-
-async def queue_sync_task(source_type: str, url: str, name: str):
-    """Queue a sync task in Redis"""
+TASK_COMPLETED_STREAM = "extraction_queue:completed"
+TASK_COMPLETED_GROUP = "auto_publish"
+TASK_COMPLETED_CONSUMER = os.getenv("HOSTNAME") or socket.gethostname()
+TASK_COMPLETED_CLAIM_IDLE_MS = 5 * 60 * 1000
+
+_publish_lock = asyncio.Lock()
+
+# Worker task completions seen, and how many of them the last successful
+# stats refresh covers; the stats_refresh job rebuilds the rollup at most
+# once a minute while the two differ
+_tasks_finished = 0
+_stats_covers_tasks = 0
+
+
+def _refresh_stats_rollup() -> bool:
+    db = SessionLocal()
     try:
-        task_id = redis_client.incr("task_counter")
-        task_data = {
-            "task_id": task_id,
-            "url": url,
-            "source_type": source_type,
-            "status": "queued",
-            "queued_at": datetime.now().isoformat()
-        }
-        
-        redis_client.lpush("extraction_queue", json.dumps(task_data))
-        logger.info(f"✓ Queued sync task for {name} (ID: {task_id})")
-        return task_id
+        refresh_stats_rollup(db)
+        return True
+    except Exception as e:
+        logger.warning(f"Stats rollup refresh failed: {e}")
+        db.rollback()
+        return False
+    finally:
+        db.close()
+
+
+async def _refresh_stats():
+    """
+    Refresh the dashboard stats rollup in a thread (a full view rebuild must
+    not stall the event loop); failures only cost freshness and are retried
+    by the next stats_refresh run
+    """
+    global _stats_covers_tasks
+    covers = _tasks_finished
+    if await asyncio.to_thread(_refresh_stats_rollup):
+        _stats_covers_tasks = max(_stats_covers_tasks, covers)
+
+
+async def queue_sync_task(source: Source, lane: str = SCHEDULED_LANE):
+    """Create the sync Task row and queue it in Redis"""
+    db = SessionLocal()
+    try:
+        # Off the event loop: the enqueue can wait on a concurrent one
+        task, created = await asyncio.to_thread(enqueue_source_sync, db, source, lane)
+        if not created:
+            # Last run still queued/running - don't pile another crawl on the site
+            logger.info(f"↷ {source.label} already {task.status} (ID: {task.id}), not queued again")
+            return None
+        logger.info(f"✓ Queued sync task for {source.label} (ID: {task.id})")
+        return task.id
         
     except Exception as e:
-        logger.error(f"✗ Failed to queue {name}: {e}")
+        logger.error(f"✗ Failed to queue {source.label}: {e}")
+        db.rollback()
         return None
+    finally:
+        db.close()
 
 
-async def sync_all_sources():
-    """Sync all event sources"""
+async def sync_all_sources(all_sources: bool = False):
+    """
+    Sync the sources scheduled for this hour, or (all_sources) re-crawl every
+    registered source in the backfill lane, behind scheduled and interactive work
+    """
     logger.info("="*80)
     logger.info("🔄 STARTING AUTOMATED SYNC FOR ALL SOURCES")
     logger.info(f"⏰ Time: {datetime.now().strftime('%Y-%m-%d %I:%M %p')}")
     logger.info("="*80)
     
+    sources = SOURCES if all_sources else scheduled_sources(datetime.now(DALLAS_TZ).hour)
+    lane = BACKFILL_LANE if all_sources else SCHEDULED_LANE
     queued_tasks = []
     
-    for source in EVENT_SOURCES:
-        task_id = await queue_sync_task(
-            source["type"],
-            source["url"],
-            source["name"]
-        )
+    for source in sources:
+        task_id = await queue_sync_task(source, lane)
         
         if task_id:
-            queued_tasks.append((source["name"], task_id))
-        
-        # Small delay between tasks
-        await asyncio.sleep(2)
+            queued_tasks.append((source.label, task_id))
     
     logger.info(f"\n✓ Queued {len(queued_tasks)} sync tasks")
     for name, task_id in queued_tasks:
         logger.info(f"  - {name} (Task #{task_id})")
-    
-    # Wait a bit, then trigger auto-publish
-    await asyncio.sleep(300)  # Wait 5 minutes for syncs to complete
-    await auto_publish_new_events()
+    # Publishing happens per source as each task completes (consume_task_completions)
 
 
 async def auto_publish_new_events():
     """Auto-publish newly imported DRAFT events to WordPress"""
+    # Completion events and the backstop cron can fire together - one run at a time
+    async with _publish_lock:
+        await _auto_publish_new_events()
+
+
+async def _auto_publish_new_events():
     logger.info("\n" + "="*80)
     logger.info("📤 AUTO-PUBLISHING NEW EVENTS TO WORDPRESS")
     logger.info("="*80)
@@ -103,48 +138,50 @@ async def auto_publish_new_events():
     db = SessionLocal()
     
     try:
-        # Get all DRAFT events without wp_post_id (never published)
-        new_events = db.query(Event).filter(
+        # Worker-ingested events reach the API here first: link cross-source
+        # duplicates before anything is published. Linked drafts stay DRAFT
+        # forever - only unlinked ones (new since the last run) are candidates
+        draft_ids = [row.id for row in db.query(Event.id).filter(
             Event.status == "DRAFT",
-            Event.wp_post_id == None
-        ).limit(50).all()  # Publish max 50 at a time
+            Event.wp_post_id == None,
+            Event.duplicate_of_id == None
+        )]
+        link_new_events(db, draft_ids)
+        
+        # Publish every never-published DRAFT (skipping duplicates) in one statement
+        published = db.execute(
+            update(Event)
+            .where(
+                Event.status == "DRAFT",
+                Event.wp_post_id == None,
+                Event.duplicate_of_id == None
+            )
+            .values(status="PUBLISHED")
+            .returning(Event.id, Event.title),
+            execution_options={"synchronize_session": False},
+        ).all()
+        db.commit()
         
-        if not new_events:
+        if not published:
             logger.info("✓ No new events to publish")
             return
         
-        logger.info(f"📋 Found {len(new_events)} new events to publish")
+        for event in published[:20]:
+            logger.info(f"  ✓ Published: {event.title[:50]}")
+        if len(published) > 20:
+            logger.info(f"  ... and {len(published) - 20} more")
         
-        published_count = 0
-        failed_count = 0
+        invalidate_event_cache()
+        await _refresh_stats()
         
-        for event in new_events:
-            try:
-                event.status = "PUBLISHED"
-                db.commit()
-
-                published_count += 1
-                logger.info(f"  ✓ Published: {event.title[:50]}")
-
-                # Notify fid-main to revalidate ISR cache
-                try:
-                    from utils.fid_main_client import notify_fid_main_event_published
-                    await notify_fid_main_event_published(event.id, event.title)
-                except Exception as notify_exc:
-                    logger.warning(f"  fid-main notify failed for {event.title[:50]}: {notify_exc}")
-
-                # Rate limiting
-                await asyncio.sleep(1)
-                
-            except Exception as e:
-                failed_count += 1
-                logger.error(f"  ✗ Error publishing {event.title[:50]}: {e}")
-                db.rollback()
-                continue
+        # Joins the current fid-main revalidation window (one POST per window)
+        try:
+            await notify_fid_main_events_published((event.id, event.title) for event in published)
+        except Exception as notify_exc:
+            logger.warning(f"  fid-main notify failed for {len(published)} events: {notify_exc}")
         
         logger.info(f"\n📊 PUBLISH SUMMARY")
-        logger.info(f"  ✓ Published: {published_count}")
-        logger.info(f"  ✗ Failed: {failed_count}")
+        logger.info(f"  ✓ Published: {len(published)}")
         logger.info("="*80)
         
     except Exception as e:
@@ -172,11 +209,16 @@ async def cleanup_old_events():
         start_of_today = dallas_now.replace(hour=0, minute=0, second=0, microsecond=0)
         
         # Delete events that ended BEFORE today (keep today's events!)
+        past = select(Event.id).where(Event.start_at < start_of_today)
+        orphan_ids = duplicates_of(db, past)
         deleted = db.query(Event).filter(
             Event.start_at < start_of_today
         ).delete()
         
         db.commit()
+        link_new_events(db, orphan_ids)
+        invalidate_event_cache()
+        await _refresh_stats()
         logger.info(f"✓ Cleaned up {deleted} events from before today")
         logger.info(f"  Dallas time: {dallas_now.strftime('%Y-%m-%d %I:%M %p %Z')}")
         logger.info(f"  Kept all events from: {start_of_today.strftime('%Y-%m-%d')} onwards")
@@ -188,28 +230,120 @@ async def cleanup_old_events():
         db.close()
 
 
+async def refresh_stats_if_tasks_finished():
+    """Refresh the stats rollup if tasks completed since the last successful refresh"""
+    if _tasks_finished > _stats_covers_tasks:
+        await _refresh_stats()
+
+
+async def _publish_completed(entries):
+    """Handle one batch of completion events; publishes once if any task produced changes"""
+    global _tasks_finished
+    finished = [fields for _, fields in entries if fields]
+    _tasks_finished += len(finished)
+    changed = [
+        fields for fields in finished
+        if fields.get("status") == "done" and int(fields.get("events_changed") or 0) > 0
+    ]
+    for fields in finished:
+        logger.info(
+            f"🏁 Task #{fields.get('task_id')} ({fields.get('source_type')}) {fields.get('status')}, "
+            f"{fields.get('events_changed', 0)} events changed"
+        )
+    if changed:
+        await auto_publish_new_events()
+
+
+async def consume_task_completions():
+    """
+    Publish each source's new events as soon as its task finishes.
+
+    Reads the worker's completion stream through a consumer group, so with
+    several API replicas each event is handled once, and events that arrive
+    while the API is down are handled when it comes back. Entries are acked
+    only after publishing; entries a dead replica left pending are reclaimed
+    after TASK_COMPLETED_CLAIM_IDLE_MS.
+    """
+    client = aioredis.from_url(REDIS_URL, decode_responses=True)
+    try:
+        await client.xgroup_create(TASK_COMPLETED_STREAM, TASK_COMPLETED_GROUP, id="$", mkstream=True)
+    except aioredis.ResponseError as e:
+        if "BUSYGROUP" not in str(e):
+            raise
+
+    # Our own unacked entries first (this replica stopped mid-publish), then new ones
+    read_from = "0"
+    while True:
+        try:
+            response = await client.xreadgroup(
+                TASK_COMPLETED_GROUP, TASK_COMPLETED_CONSUMER,
+                {TASK_COMPLETED_STREAM: read_from}, count=100, block=30000
+            )
+            entries = response[0][1] if response else []
+            if read_from == "0" and not entries:
+                read_from = ">"
+            _, reclaimed, *_ = await client.xautoclaim(
+                TASK_COMPLETED_STREAM, TASK_COMPLETED_GROUP, TASK_COMPLETED_CONSUMER,
+                TASK_COMPLETED_CLAIM_IDLE_MS, "0-0", count=100
+            )
+            entries += reclaimed
+            if not entries:
+                continue
+
+            await _publish_completed(entries)
+            await client.xack(TASK_COMPLETED_STREAM, TASK_COMPLETED_GROUP, *[entry_id for entry_id, _ in entries])
+        except asyncio.CancelledError:
+            await client.aclose()
+            raise
+        except Exception as e:
+            logger.error(f"✗ Task completion consumer error: {e}")
+            await asyncio.sleep(5)
+
+
 # Initialize scheduler
 scheduler = AsyncIOScheduler()
+_completion_consumer = None
 
 
 def start_scheduler():
     """Start the automated scheduler"""
     
+    global _completion_consumer
+    
     # Hourly sync: Every hour at :00 minutes
     scheduler.add_job(
         sync_all_sources,
         CronTrigger(minute=0, timezone='America/Chicago'),
         id='hourly_sync',
-        name='Hourly Event Sync & Publish',
+        name='Hourly Event Sync',
         replace_existing=True
     )
     
-    # Auto-publish check: Every hour at :30 minutes (backup)
+    # Publishing is driven by task completions; this only catches drafts
+    # whose completion event was lost (e.g. Redis restarted without persistence)
     scheduler.add_job(
         auto_publish_new_events,
-        CronTrigger(minute=30, timezone='America/Chicago'),
-        id='hourly_publish',
-        name='Hourly Auto-Publish Check',
+        CronTrigger(hour='*/6', minute=30, timezone='America/Chicago'),
+        id='publish_backstop',
+        name='Auto-Publish Backstop (every 6h)',
+        replace_existing=True
+    )
+    
+    # Task counts/errors in the stats rollup, debounced across completions
+    scheduler.add_job(
+        refresh_stats_if_tasks_finished,
+        CronTrigger(minute='*', timezone='America/Chicago'),
+        id='stats_refresh',
+        name='Stats Rollup Refresh (every minute, if tasks finished)',
+        replace_existing=True
+    )
+    
+    # Failed fid-main revalidations whose backoff has elapsed
+    scheduler.add_job(
+        flush_revalidations,
+        CronTrigger(minute='*', timezone='America/Chicago'),
+        id='revalidation_retry',
+        name='fid-main Revalidation Retry (every minute)',
         replace_existing=True
     )
     
@@ -223,12 +357,15 @@ def start_scheduler():
     )
     
     scheduler.start()
+    _completion_consumer = asyncio.get_event_loop().create_task(consume_task_completions())
     logger.info("="*80)
     logger.info("🚀 AUTOMATED SCHEDULER STARTED")
     logger.info("="*80)
     logger.info("📅 Schedule:")
     logger.info("  - Hourly Sync: Every hour at :00 (CT)")
-    logger.info("  - Hourly Auto-Publish: Every hour at :30 (CT)")
+    logger.info("  - Auto-Publish: as each sync task completes (backstop every 6h at :30)")
+    logger.info("  - Stats Rollup Refresh: every minute, if tasks finished")
+    logger.info("  - fid-main Revalidation Retry: every minute")
     logger.info("  - Daily Cleanup: 2:00 AM Central Time")
     logger.info("="*80)
     logger.info("\n✓ Scheduler is now running in background...")
@@ -238,6 +375,8 @@ def start_scheduler():
 
 def stop_scheduler():
     """Stop the scheduler"""
+    if _completion_consumer:
+        _completion_consumer.cancel()
     if scheduler.running:
         scheduler.shutdown()
         logger.info("⏹ Scheduler stopped")
@@ -247,4 +386,4 @@ def stop_scheduler():
 async def trigger_sync_now():
     """Manually trigger sync (for testing)"""
     logger.info("🔄 MANUAL SYNC TRIGGERED")
-    await sync_all_sources()
+    await sync_all_sources(all_sources=True)
@@ -2,7 +2,7 @@ import logging
 
 from pydantic import BaseModel, HttpUrl, ValidationInfo, field_validator
 from datetime import datetime
-from typing import Optional
+from typing import Dict, Optional
 from decimal import Decimal
 
 _PRICE_TIER_MAP = {
@@ -55,11 +55,13 @@ class EventResponse(BaseModel):
     price_tier: str
     price_amount: Optional[Decimal]
     image_url: Optional[str]
+    image_variants: Optional[Dict[str, Dict[str, str]]] = None  # format -> width -> URL
     source_url: str
     source_type: str
     category: Optional[str]
     fid_hash: str
     status: str
+    duplicate_of_id: Optional[int] = None  # Canonical event when this is a cross-source duplicate
     wp_post_id: Optional[int]
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
@@ -87,6 +89,35 @@ class EventResponse(BaseModel):
     class Config:
         from_attributes = True
 
+class EventCardResponse(BaseModel):
+    """Compact listing row (view=card): what a directory card renders, no description"""
+    id: int
+    title: str
+    start_at: datetime
+    end_at: Optional[datetime]
+    venue: str = ""
+    city: str = ""
+    price_tier: str
+    price_amount: Optional[Decimal]
+    image_url: Optional[str]
+    image_variants: Optional[Dict[str, Dict[str, str]]] = None
+    category: Optional[str]
+
+    @field_validator('venue', 'city', mode='before')
+    @classmethod
+    def coerce_none_to_empty_string(cls, v: Optional[str]) -> str:
+        return "" if v is None else v
+
+    @field_validator('price_tier', mode='before')
+    @classmethod
+    def normalize_price_tier(cls, v) -> str:
+        if v is None:
+            return 'paid'
+        return _PRICE_TIER_MAP.get(str(getattr(v, 'value', v)).lower(), 'paid')
+
+    class Config:
+        from_attributes = True
+
 class EventFilter(BaseModel):
     status: Optional[str] = None
     city: Optional[str] = None
@@ -1,5 +1,6 @@
 from pydantic import BaseModel
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
+from datetime import datetime
 
 class StatsResponse(BaseModel):
     total_events: int
@@ -12,3 +13,4 @@ class StatsResponse(BaseModel):
     events_by_status: Dict[str, int]
     events_by_city: List[Dict[str, Any]]
     recent_errors: List[Dict[str, Any]]
+    computed_at: Optional[datetime] = None  # When the stats rollup was last refreshed
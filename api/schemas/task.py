@@ -13,6 +13,8 @@ class TaskResponse(BaseModel):
     logs: Optional[str]
     error_message: Optional[str]
     events_extracted: int
+    events_changed: Optional[int] = 0
+    events_unchanged: Optional[int] = 0
     created_at: datetime
     updated_at: Optional[datetime]
     
@@ -0,0 +1,96 @@
+"""
+Bulk sync source registry.
+
+One entry per venue/organizer source: the task it queues, when the
+scheduler runs it, how fresh its data should be and what the sync endpoint
+reports. POST /api/sync/{source}, GET /api/sync/status and the hourly
+scheduler all read this list - add a source here (and its extractor in
+worker/sources.py, keeping name/task_source_type/url in sync), not a new
+endpoint.
+"""
+
+from datetime import timedelta
+from typing import Any, Dict, List, NamedTuple, Optional
+
+
+class Source(NamedTuple):
+    name: str               # Status key; POST /api/sync/{name} (hyphens or underscores)
+    label: str              # Human-readable name for messages and logs
+    task_source_type: str   # tasks.source_type the worker dispatches on
+    url: str                # Pseudo-URL the sync task is queued with
+    schedule_hours: Optional[int] = 1    # Scheduled every N hours (CT); None = manual only
+    freshness: timedelta = timedelta(hours=3)  # Older last successful sync = stale
+    details: Optional[Dict[str, Any]] = None   # Extra fields for the sync response
+
+    @property
+    def slug(self) -> str:
+        return self.name.replace("_", "-")
+
+
+SOURCES: List[Source] = [
+    Source("eventbrite", "Eventbrite Dallas", "eventbrite_bulk", "bulk:eventbrite:dallas",
+           details={"note": "Configure Eventbrite organizers in settings for more events"}),
+    Source("dallas_arboretum", "Dallas Arboretum", "dallas_arboretum_bulk", "bulk:dallas_arboretum",
+           details={
+               "venue": "Dallas Arboretum & Botanical Garden",
+               "focus": "Family-friendly and kids events",
+               "categories": ["Nature & Gardens", "Family & Kids", "Education", "Holiday"],
+           }),
+    Source("klyde_warren_park", "Klyde Warren Park", "klyde_warren_park_bulk", "bulk:klyde_warren_park",
+           details={
+               "venue": "Klyde Warren Park",
+               "focus": "Family-friendly and community events",
+               "categories": ["Music & Concerts", "Movies & Film", "Family & Kids", "Food & Dining", "Arts & Theatre"],
+           }),
+    Source("perot_museum", "Perot Museum", "perot_museum_bulk", "bulk:perot_museum",
+           details={
+               "venue": "Perot Museum of Nature and Science",
+               "focus": "Educational and science events",
+               "categories": ["Education & Science", "Family & Kids", "Workshops"],
+           }),
+    Source("dallas_library", "Dallas Public Library", "dallas_library_bulk", "bulk:dallas_library",
+           details={
+               "venue": "Dallas Public Library",
+               "focus": "FREE educational and community events",
+               "categories": ["Reading & Literacy", "Arts & Crafts", "STEM", "Education"],
+           }),
+    Source("dallas_zoo", "Dallas Zoo", "dallas_zoo_bulk", "bulk:dallas_zoo",
+           details={
+               "venue": "Dallas Zoo",
+               "focus": "Animal encounters and nature events",
+               "categories": ["Animals & Nature", "Family & Kids", "Education"],
+           }),
+    Source("fair_park", "Fair Park", "fair_park_bulk", "bulk:fair_park",
+           details={
+               "venue": "Fair Park",
+               "focus": "Festivals and cultural events",
+               "categories": ["Festivals & Fairs", "Cultural Events", "Music & Concerts", "Sports"],
+           }),
+    Source("house_of_blues", "House of Blues Dallas", "house_of_blues_bulk", "bulk:house_of_blues",
+           details={
+               "venue": "House of Blues Dallas",
+               "focus": "Live music and entertainment",
+               "categories": ["Music & Performance", "Concerts", "Live Shows"],
+           }),
+    Source("factory_deep_ellum", "Factory Deep Ellum", "factory_deep_ellum_bulk", "bulk:factory_deep_ellum",
+           details={
+               "venue": "The Factory in Deep Ellum",
+               "focus": "Live music and entertainment",
+               "categories": ["Music & Performance", "Concerts", "Live Shows"],
+           }),
+]
+
+SOURCES_BY_NAME: Dict[str, Source] = {source.name: source for source in SOURCES}
+
+
+def get_source(name: str) -> Optional[Source]:
+    """Registered source by name or slug ("dallas-arboretum" / "dallas_arboretum")"""
+    return SOURCES_BY_NAME.get(name.replace("-", "_"))
+
+
+def scheduled_sources(hour: int) -> List[Source]:
+    """Sources the scheduler queues at this hour of the day (Central Time)"""
+    return [
+        source for source in SOURCES
+        if source.schedule_hours and hour % source.schedule_hours == 0
+    ]
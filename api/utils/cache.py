@@ -0,0 +1,173 @@
+"""
+Redis response cache and HTTP validators for the public, read-heavy event
+endpoints.
+
+Cached bodies live under a key that embeds a global generation number
+(EVENTS_CACHE_GENERATION_KEY). Any code path that changes events calls
+invalidate_event_cache(), which bumps the generation and stamps
+EVENTS_CACHE_LAST_MODIFIED_KEY, so every cached body becomes unreachable at
+once; stale keys age out through their TTL. The worker bumps the same keys
+after it writes new events.
+
+The same generation doubles as the events table version for ETag /
+Last-Modified: a conditional request whose validators still match is
+answered 304 without touching the database.
+
+Redis trouble never breaks a request: lookups fall through to the database,
+writes are skipped and validators are omitted, with a warning in the log.
+"""
+
+import hashlib
+import json
+import logging
+import time
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+import redis
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+redis_client = redis.from_url(settings.REDIS_URL, decode_responses=True)
+
+EVENTS_CACHE_GENERATION_KEY = "events_cache:generation"
+EVENTS_CACHE_LAST_MODIFIED_KEY = "events_cache:last_modified"
+EVENTS_CACHE_STATS_KEY = "events_cache:stats"
+
+
+def _events_version() -> Tuple[str, int]:
+    """(generation, last-modified epoch seconds) of the events table.
+
+    Seeded from the clock when missing (fresh or flushed Redis) so old
+    ETags can never match again after the counter is lost.
+    """
+    generation, last_modified = redis_client.mget(
+        EVENTS_CACHE_GENERATION_KEY, EVENTS_CACHE_LAST_MODIFIED_KEY
+    )
+    if generation is None or last_modified is None:
+        now = int(time.time())
+        pipe = redis_client.pipeline()
+        pipe.set(EVENTS_CACHE_GENERATION_KEY, now, nx=True)
+        pipe.set(EVENTS_CACHE_LAST_MODIFIED_KEY, now, nx=True)
+        pipe.mget(EVENTS_CACHE_GENERATION_KEY, EVENTS_CACHE_LAST_MODIFIED_KEY)
+        generation, last_modified = pipe.execute()[-1]
+    return generation, int(last_modified)
+
+
+def _params_digest(params: Mapping[str, Any]) -> str:
+    """Hash of the normalized (sorted, non-empty) params."""
+    normalized = sorted(
+        (str(k), str(v)) for k, v in params.items() if v is not None and v != ""
+    )
+    return hashlib.sha1(json.dumps(normalized).encode()).hexdigest()
+
+
+def _cache_key(namespace: str, params: Mapping[str, Any]) -> str:
+    generation, _ = _events_version()
+    return f"events_cache:{generation}:{namespace}:{_params_digest(params)}"
+
+
+def event_validators(namespace: str, params: Mapping[str, Any]) -> Dict[str, str]:
+    """Strong ETag and Last-Modified for a response; {} if Redis is unavailable."""
+    try:
+        generation, last_modified = _events_version()
+    except redis.RedisError as exc:
+        logger.warning("Event version lookup failed for %s: %s", namespace, exc)
+        return {}
+    tag = hashlib.sha1(f"{generation}:{namespace}:{_params_digest(params)}".encode()).hexdigest()
+    return {
+        "ETag": f'"{tag}"',
+        "Last-Modified": formatdate(last_modified, usegmt=True),
+    }
+
+
+def not_modified_response(request: Request, validators: Dict[str, str]) -> Optional[Response]:
+    """A 304 if the request's If-None-Match / If-Modified-Since still match, else None."""
+    if not validators:
+        return None
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        # If-None-Match wins over If-Modified-Since (RFC 9110 13.2.2)
+        tags = [t.strip().removeprefix("W/") for t in if_none_match.split(",")]
+        matched = "*" in tags or validators["ETag"] in tags
+    else:
+        if_modified_since = request.headers.get("if-modified-since")
+        if not if_modified_since:
+            return None
+        try:
+            matched = parsedate_to_datetime(validators["Last-Modified"]) <= parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return None
+
+    return Response(status_code=304, headers=validators) if matched else None
+
+
+def get_cached_response(
+    namespace: str,
+    params: Mapping[str, Any],
+    headers: Optional[Dict[str, str]] = None,
+) -> Optional[Response]:
+    """Return the cached response for these params, or None on a miss."""
+    try:
+        key = _cache_key(namespace, params)
+        cached = redis_client.get(key)
+        redis_client.hincrby(EVENTS_CACHE_STATS_KEY, f"{namespace}:{'hits' if cached else 'misses'}", 1)
+    except redis.RedisError as exc:
+        logger.warning("Response cache lookup failed for %s: %s", namespace, exc)
+        return None
+
+    if not cached:
+        return None
+
+    entry = json.loads(cached)
+    return Response(
+        content=entry["body"],
+        media_type="application/json",
+        headers={**(entry.get("headers") or {}), **(headers or {})},
+    )
+
+
+def cache_response(
+    namespace: str,
+    params: Mapping[str, Any],
+    payload: Any,
+    headers: Optional[Dict[str, str]] = None,
+) -> Response:
+    """Serialize payload to JSON, store it under these params and return it as a Response."""
+    body = json.dumps(jsonable_encoder(payload))
+    try:
+        redis_client.set(
+            _cache_key(namespace, params),
+            json.dumps({"body": body, "headers": headers or {}}),
+            ex=settings.RESPONSE_CACHE_TTL,
+        )
+    except redis.RedisError as exc:
+        logger.warning("Response cache store failed for %s: %s", namespace, exc)
+
+    return Response(content=body, media_type="application/json", headers=headers or {})
+
+
+def invalidate_event_cache() -> None:
+    """Drop every cached event response (call after any write that changes events)."""
+    try:
+        pipe = redis_client.pipeline()
+        pipe.incr(EVENTS_CACHE_GENERATION_KEY)
+        pipe.set(EVENTS_CACHE_LAST_MODIFIED_KEY, int(time.time()))
+        pipe.execute()
+    except redis.RedisError as exc:
+        logger.warning("Response cache invalidation failed: %s", exc)
+
+
+def get_cache_stats() -> Dict[str, Dict[str, int]]:
+    """Hit/miss counters per cached endpoint, e.g. {"events": {"hits": 10, "misses": 2}}."""
+    raw = redis_client.hgetall(EVENTS_CACHE_STATS_KEY)
+    stats: Dict[str, Dict[str, int]] = {}
+    for field, value in raw.items():
+        namespace, _, kind = field.rpartition(":")
+        stats.setdefault(namespace, {"hits": 0, "misses": 0})[kind] = int(value)
+    return stats
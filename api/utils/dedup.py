@@ -0,0 +1,336 @@
+"""
+Fuzzy cross-source duplicate detection.
+
+The same show imported from Ticketmaster, Eventbrite and the venue's own site
+gets three different fid_hashes. This module links such rows: every
+duplicate points at the oldest row of its cluster through
+events.duplicate_of_id, and the public listing hides linked duplicates. Rows
+are linked, never merged or deleted, so curated fields on either side stay
+intact and a wrong link is undone by clearing one column.
+
+Matching never compares all pairs:
+
+1. Blocking - only events on the same Dallas calendar day are compared,
+   plus those on the neighbouring days within DEDUP_TIME_TOLERANCE of its
+   midnights (an 11:30 PM listing and a 12:30 AM one still meet).
+2. LSH - each title becomes a MinHash signature over character shingles;
+   signatures are cut into bands and only events sharing a band bucket in
+   the same block become candidates.
+3. Verification - candidates must have estimated title similarity >=
+   DEDUP_TITLE_THRESHOLD, start within DEDUP_TIME_TOLERANCE of each other
+   and a compatible venue (overlapping venue tokens, or one side unknown).
+
+Only PUBLISHED and DRAFT rows take part (DEDUP_STATUSES); a PENDING
+submission or a REJECTED row is never linked and never hides another row.
+The canonical row of a cluster is its PUBLISHED row if there is one, then
+its DRAFT, oldest first, so a paid listing is never hidden behind a draft.
+Status changes therefore re-run linking for the row's day, and deleting a
+canonical row re-links its duplicates (one of them takes its place).
+
+Work is proportional to the number of events per day, so a batch rescan
+over hundreds of thousands of rows streams through the table one day at a
+time.
+"""
+
+import logging
+import random
+import re
+import unicodedata
+import zlib
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple
+
+import pytz
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from models.event import Event
+
+logger = logging.getLogger(__name__)
+
+DALLAS_TZ = pytz.timezone("America/Chicago")
+
+DEDUP_NUM_PERM = 64
+DEDUP_BANDS = 16  # 16 bands x 4 rows: pairs at ~0.6 similarity collide with p ~ 0.9
+DEDUP_TITLE_THRESHOLD = 0.6
+DEDUP_TIME_TOLERANCE = timedelta(hours=3)  # "doors" vs "show" times differ between sources
+SHINGLE_SIZE = 3
+
+# Statuses that cluster, in canonical preference order
+DEDUP_STATUSES = ("PUBLISHED", "DRAFT")
+
+# Words that differ between sources without changing which event it is
+_TITLE_NOISE = {
+    "the", "a", "an", "and", "at", "in", "with", "live", "presents", "presented",
+    "by", "tickets", "tour", "dallas", "tx", "texas", "concert", "show", "event",
+}
+_VENUE_NOISE = {"the", "of", "at", "dallas", "tx", "texas", "center", "centre"}
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_rng = random.Random(1729)  # Fixed seed: signatures must be comparable across runs
+_PERMUTATIONS = [
+    (_rng.randrange(1, _MERSENNE_PRIME), _rng.randrange(0, _MERSENNE_PRIME))
+    for _ in range(DEDUP_NUM_PERM)
+]
+
+
+class DedupCandidate(NamedTuple):
+    id: int
+    start_at: datetime
+    signature: Tuple[int, ...]
+    venue_tokens: frozenset
+    duplicate_of_id: Optional[int]
+    status: str
+
+
+def _tokens(text: Optional[str], noise: Set[str]) -> List[str]:
+    text = unicodedata.normalize("NFKD", text or "").encode("ascii", "ignore").decode().lower()
+    return [t for t in re.findall(r"[a-z0-9]+", text) if t not in noise]
+
+
+def title_shingles(title: str) -> Set[str]:
+    """Character shingles of the normalized title ("The Eras Tour!" -> {"era", "ras", ...})"""
+    normalized = " ".join(_tokens(title, _TITLE_NOISE)) or (title or "").lower()
+    if len(normalized) <= SHINGLE_SIZE:
+        return {normalized}
+    return {normalized[i:i + SHINGLE_SIZE] for i in range(len(normalized) - SHINGLE_SIZE + 1)}
+
+
+def minhash(shingles: Iterable[str]) -> Tuple[int, ...]:
+    hashes = [zlib.crc32(s.encode()) for s in shingles] or [0]
+    return tuple(
+        min((a * h + b) % _MERSENNE_PRIME for h in hashes)
+        for a, b in _PERMUTATIONS
+    )
+
+
+def signature_similarity(a: Tuple[int, ...], b: Tuple[int, ...]) -> float:
+    """Estimated Jaccard similarity of the two titles' shingle sets"""
+    return sum(x == y for x, y in zip(a, b)) / DEDUP_NUM_PERM
+
+
+def dallas_day(start_at: datetime) -> date:
+    if start_at.tzinfo is None:
+        start_at = pytz.utc.localize(start_at)
+    return start_at.astimezone(DALLAS_TZ).date()
+
+
+def _day_bounds(day: date) -> Tuple[datetime, datetime]:
+    start = DALLAS_TZ.localize(datetime(day.year, day.month, day.day))
+    return start, DALLAS_TZ.localize(datetime.combine(day + timedelta(days=1), datetime.min.time()))
+
+
+def _candidate(row) -> DedupCandidate:
+    return DedupCandidate(
+        id=row.id,
+        start_at=row.start_at,
+        signature=minhash(title_shingles(row.title)),
+        venue_tokens=frozenset(_tokens(row.venue, _VENUE_NOISE)),
+        duplicate_of_id=row.duplicate_of_id,
+        status=row.status,
+    )
+
+
+def _is_match(a: DedupCandidate, b: DedupCandidate) -> bool:
+    if abs(a.start_at - b.start_at) > DEDUP_TIME_TOLERANCE:
+        return False
+    if a.venue_tokens and b.venue_tokens and not (a.venue_tokens & b.venue_tokens):
+        return False
+    return signature_similarity(a.signature, b.signature) >= DEDUP_TITLE_THRESHOLD
+
+
+def cluster_day(candidates: List[DedupCandidate]) -> Dict[int, int]:
+    """
+    Cluster one day's events (rows outside DEDUP_STATUSES are skipped).
+
+    Returns:
+        {event id: canonical id} for every event in a cluster of two or
+        more; the canonical row is the cluster's first by status
+        (DEDUP_STATUSES order), then the oldest (lowest) id
+    """
+    candidates = [c for c in candidates if c.status in DEDUP_STATUSES]
+    rows_per_band = DEDUP_NUM_PERM // DEDUP_BANDS
+    buckets: Dict[Tuple[int, Tuple[int, ...]], List[int]] = defaultdict(list)
+    for i, c in enumerate(candidates):
+        for band in range(DEDUP_BANDS):
+            buckets[(band, c.signature[band * rows_per_band:(band + 1) * rows_per_band])].append(i)
+
+    parent = list(range(len(candidates)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    checked: Set[Tuple[int, int]] = set()
+    for members in buckets.values():
+        for x in range(len(members)):
+            for y in range(x + 1, len(members)):
+                pair = (members[x], members[y])
+                if pair in checked:
+                    continue
+                checked.add(pair)
+                if _is_match(candidates[pair[0]], candidates[pair[1]]):
+                    parent[find(pair[0])] = find(pair[1])
+
+    clusters: Dict[int, List[DedupCandidate]] = defaultdict(list)
+    for i in range(len(candidates)):
+        clusters[find(i)].append(candidates[i])
+
+    canonical: Dict[int, int] = {}
+    for members in clusters.values():
+        if len(members) > 1:
+            root = min(members, key=lambda c: (DEDUP_STATUSES.index(c.status), c.id)).id
+            for c in members:
+                canonical[c.id] = root
+    return canonical
+
+
+def _apply_links(db: Session, candidates: List[DedupCandidate], canonical: Dict[int, int],
+                 only_ids: Optional[Set[int]] = None, owned: Optional[Set[int]] = None) -> int:
+    """
+    Write duplicate_of_id for one block; returns rows changed
+
+    With only_ids, only those rows, rows currently linked to them and the
+    clusters of either are touched. With owned, only those rows are written
+    (the rest of the block is context from neighbouring days).
+    """
+    if only_ids is not None:
+        only_ids = only_ids | {c.id for c in candidates if c.duplicate_of_id in only_ids}
+        roots = {canonical[i] for i in only_ids if i in canonical}
+    changed = 0
+    for c in candidates:
+        if only_ids is not None and c.id not in only_ids and canonical.get(c.id) not in roots:
+            continue
+        if owned is not None and c.id not in owned:
+            continue
+        target = canonical.get(c.id)
+        target = None if target == c.id else target
+        if c.duplicate_of_id != target:
+            db.execute(update(Event).where(Event.id == c.id).values(duplicate_of_id=target))
+            changed += 1
+    return changed
+
+
+_CANDIDATE_COLUMNS = (Event.id, Event.title, Event.venue, Event.start_at, Event.duplicate_of_id, Event.status)
+
+
+def link_duplicates(db: Session, event_ids: Iterable[int]) -> int:
+    """
+    Ingest-time linking for freshly written events (commits).
+
+    Only clusters containing one of event_ids are touched; links elsewhere
+    on the same days are left to the batch rescan.
+
+    Returns:
+        Number of events whose duplicate link changed
+    """
+    event_ids = set(event_ids)
+    if not event_ids:
+        return 0
+
+    days = {
+        dallas_day(start_at)
+        for (start_at,) in db.execute(select(Event.start_at).where(Event.id.in_(event_ids)))
+    }
+    changed = 0
+    for day in days:
+        start, end = _day_bounds(day)
+        rows = db.execute(
+            select(*_CANDIDATE_COLUMNS).where(
+                Event.start_at >= start - DEDUP_TIME_TOLERANCE,
+                Event.start_at < end + DEDUP_TIME_TOLERANCE,
+            )
+        ).all()
+        candidates = [_candidate(row) for row in rows]
+        changed += _apply_links(db, candidates, cluster_day(candidates), only_ids=event_ids)
+    db.commit()
+    if changed:
+        logger.info("Linked %d cross-source duplicate events", changed)
+    return changed
+
+
+def link_new_events(db: Session, event_ids: Iterable[int]) -> int:
+    """link_duplicates for API write paths: a dedup failure is logged, never fails the write"""
+    try:
+        return link_duplicates(db, event_ids)
+    except Exception as e:
+        logger.warning("Duplicate linking failed for events %s: %s", list(event_ids), e)
+        db.rollback()
+        return 0
+
+
+def duplicates_of(db: Session, event_ids) -> List[int]:
+    """
+    Rows linked to any of event_ids (a list or a select of ids), except those
+    rows themselves - call before deleting event_ids, then link_new_events()
+    the result after the commit so each cluster gets a new canonical row
+    """
+    return [
+        event_id for (event_id,) in db.execute(
+            select(Event.id).where(Event.duplicate_of_id.in_(event_ids), Event.id.not_in(event_ids))
+        )
+    ]
+
+
+def _link_day(db: Session, day: date, before: List[DedupCandidate], rows: List[DedupCandidate],
+              after: List[DedupCandidate]) -> int:
+    """Re-cluster one day's rows together with the neighbouring days' rows near its midnights"""
+    start, end = _day_bounds(day)
+    block = (
+        [c for c in before if c.start_at >= start - DEDUP_TIME_TOLERANCE]
+        + rows
+        + [c for c in after if c.start_at < end + DEDUP_TIME_TOLERANCE]
+    )
+    return _apply_links(db, block, cluster_day(block), owned={c.id for c in rows})
+
+
+def rescan_duplicates(db: Session, since: Optional[datetime] = None, batch_size: int = 1000) -> Dict[str, int]:
+    """
+    Recompute duplicate links over the whole table (or events starting at/after since).
+
+    Streams rows in start_at order with a server-side cursor and clusters one
+    Dallas day at a time (with the edges of the days before and after),
+    committing per day, so memory is bounded by three days rather than the
+    table.
+
+    Returns:
+        {"events": rows scanned, "days": days scanned, "changed": links changed}
+    """
+    statement = select(*_CANDIDATE_COLUMNS).order_by(Event.start_at, Event.id)
+    if since is not None:
+        statement = statement.where(Event.start_at >= since)
+
+    stats = {"events": 0, "days": 0, "changed": 0}
+
+    def stream_days(reader) -> Iterator[Tuple[date, List[DedupCandidate]]]:
+        current_day: Optional[date] = None
+        day_rows: List[DedupCandidate] = []
+        for row in reader.execution_options(yield_per=batch_size).execute(statement):
+            stats["events"] += 1
+            day = dallas_day(row.start_at)
+            if day != current_day and day_rows:
+                yield current_day, day_rows
+                day_rows = []
+            current_day = day
+            day_rows.append(_candidate(row))
+        if day_rows:
+            yield current_day, day_rows
+
+    # A separate connection for the streaming read: committing the updates must not end the cursor
+    with db.get_bind().connect() as reader:
+        days = stream_days(reader)
+        before: List[DedupCandidate] = []
+        current = next(days, None)
+        while current is not None:
+            following = next(days, None)  # Read one day ahead for its early rows
+            day, rows = current
+            stats["days"] += 1
+            stats["changed"] += _link_day(db, day, before, rows, following[1] if following else [])
+            db.commit()
+            before, current = rows, following
+
+    logger.info("Duplicate rescan: %s", stats)
+    return stats
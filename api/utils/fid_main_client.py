@@ -7,23 +7,52 @@ fid-main exposes POST /api/revalidate (confirmed: returns 401 on bad secret,
 Set REVALIDATE_SECRET in Railway env vars. Set the same value as
 REVALIDATE_SECRET in the fid-main deployment.
 
-On any failure this function logs loudly but does NOT raise — the event is
+Publish paths never POST directly: notify_* adds the event's paths to an
+in-process buffer and returns. The first path opens a debounce window of
+REVALIDATE_DEBOUNCE_SECONDS; when it closes, everything requested meanwhile
+(listing pages once, however many events were published) goes out in a
+single POST over a shared keep-alive client.
+
+Failed paths are parked in Redis (REVALIDATE_RETRY_KEY) with exponential
+backoff and merged into a later window; the scheduler's retry job flushes
+them when no publish is opening windows. Nothing here raises — the event is
 already PUBLISHED in the DB; fid-main will pick it up at next ISR tick
 (600 s worst case). The Stripe webhook must return 200 regardless.
 """
 
+import asyncio
 import logging
 import re
+import time
 import unicodedata
+from typing import Dict, Iterable, List, Optional, Tuple
 
 import httpx
 
 from config import settings
+from utils.cache import redis_client
 
 logger = logging.getLogger(__name__)
 
 _FID_MAIN_REVALIDATE = f"{settings.FID_MAIN_URL}/api/revalidate"
 
+# Paths requested within this many seconds of each other share one POST
+REVALIDATE_DEBOUNCE_SECONDS = 2.0
+
+# Failed paths wait here (sorted set: path -> next attempt, epoch seconds)
+# and ride along with a later window; the hash counts attempts per path
+REVALIDATE_RETRY_KEY = "fid_main:revalidate_retry"
+REVALIDATE_ATTEMPTS_KEY = "fid_main:revalidate_attempts"
+REVALIDATE_MAX_ATTEMPTS = 6
+REVALIDATE_RETRY_BASE_SECONDS = 30
+REVALIDATE_RETRY_MAX_SECONDS = 3600
+REVALIDATE_RETRY_BATCH = 500  # Due retries added to one window at most
+
+_client: Optional[httpx.AsyncClient] = None
+_pending: Dict[str, None] = {}  # Ordered set of paths in the open window
+_flush_task: Optional[asyncio.Task] = None
+_flush_lock = asyncio.Lock()  # One POST in flight: a retry flush never races a window
+
 
 def _slugify_title(title: str) -> str:
     """Exact replica of fid-main lib/events/slug.ts slugifyTitle()."""
@@ -42,44 +71,192 @@ def build_event_slug(event_id: int, title: str) -> str:
     return f"{_slugify_title(title)}-{event_id}"
 
 
-async def notify_fid_main_event_published(event_id: int, title: str) -> None:
-    """POST revalidation paths to fid-main after an event is published."""
-    if not settings.REVALIDATE_SECRET:
-        logger.warning(
-            "REVALIDATE_SECRET not set — skipping fid-main cache revalidation "
-            "for event_id=%s. Set the env var to enable instant publish.",
-            event_id,
+# Above this many newly published events only the listing pages are
+# revalidated: new detail pages aren't in fid-main's ISR cache yet anyway
+REVALIDATE_MAX_EVENT_PATHS = 200
+
+# Pages that list upcoming events (homepage sidebar included)
+_LISTING_PATHS = ["/events/", "/"]
+
+
+def build_revalidate_paths(events: Iterable[Tuple[int, str]]) -> List[str]:
+    """Deduplicated paths for a batch of (event_id, title) pairs: listings once, then each event page"""
+    events = list(events)
+    paths = list(_LISTING_PATHS)
+    if len(events) <= REVALIDATE_MAX_EVENT_PATHS:
+        paths.extend(dict.fromkeys(f"/events/{build_event_slug(event_id, title)}/" for event_id, title in events))
+    return paths
+
+
+def _secret_missing(event_ids: List[int]) -> bool:
+    if settings.REVALIDATE_SECRET:
+        return False
+    logger.warning(
+        "REVALIDATE_SECRET not set — skipping fid-main cache revalidation "
+        "for event_ids=%s. Set the env var to enable instant publish.",
+        event_ids[:20],
+    )
+    return True
+
+
+def _get_client() -> httpx.AsyncClient:
+    """Shared keep-alive client: every flush reuses the same connection to fid-main"""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            timeout=10.0,
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=2, max_keepalive_connections=1),
         )
-        return
+    return _client
 
-    slug = build_event_slug(event_id, title)
-    paths = [
-        "/events/",
-        f"/events/{slug}/",
-        "/",          # homepage sidebar uses upcoming events
-    ]
 
+def request_revalidation(paths: Iterable[str]) -> None:
+    """
+    Add paths to the current debounce window; the window's single POST goes
+    out REVALIDATE_DEBOUNCE_SECONDS after the first path arrived
+    """
+    global _flush_task
+    _pending.update(dict.fromkeys(paths))
+    if _pending and (_flush_task is None or _flush_task.done()):
+        _flush_task = asyncio.get_running_loop().create_task(_flush_after_window())
+
+
+async def _flush_after_window() -> None:
+    global _flush_task
+    await asyncio.sleep(REVALIDATE_DEBOUNCE_SECONDS)
+    # Paths requested from here on open the next window
+    _flush_task = None
+    await flush_revalidations()
+
+
+def _due_retries() -> List[str]:
     try:
-        async with httpx.AsyncClient(timeout=10.0, follow_redirects=True) as client:
-            resp = await client.post(
-                _FID_MAIN_REVALIDATE,
-                json={"paths": paths},
-                headers={"x-revalidate-secret": settings.REVALIDATE_SECRET},
-            )
-        if resp.status_code == 200:
-            logger.info(
-                "fid-main revalidation triggered for event_id=%s slug=%s paths=%s",
-                event_id, slug, paths,
-            )
-        else:
+        return redis_client.zrangebyscore(
+            REVALIDATE_RETRY_KEY, "-inf", time.time(), start=0, num=REVALIDATE_RETRY_BATCH,
+        )
+    except Exception as exc:
+        logger.warning("fid-main revalidation retry queue unavailable: %s", exc)
+        return []
+
+
+def _forget_retries(paths: List[str]) -> None:
+    try:
+        pipe = redis_client.pipeline(transaction=True)
+        pipe.zrem(REVALIDATE_RETRY_KEY, *paths)
+        pipe.hdel(REVALIDATE_ATTEMPTS_KEY, *paths)
+        pipe.execute()
+    except Exception as exc:
+        logger.warning("Could not clear %d retried fid-main paths: %s", len(paths), exc)
+
+
+def _schedule_retries(paths: List[str]) -> None:
+    """Park failed paths in Redis with exponential backoff; give up after REVALIDATE_MAX_ATTEMPTS"""
+    try:
+        pipe = redis_client.pipeline(transaction=False)
+        for path in paths:
+            pipe.hincrby(REVALIDATE_ATTEMPTS_KEY, path, 1)
+        attempts = pipe.execute()
+
+        now = time.time()
+        retry, given_up = {}, []
+        for path, attempt in zip(paths, attempts):
+            if attempt >= REVALIDATE_MAX_ATTEMPTS:
+                given_up.append(path)
+            else:
+                delay = min(REVALIDATE_RETRY_BASE_SECONDS * 2 ** (attempt - 1), REVALIDATE_RETRY_MAX_SECONDS)
+                retry[path] = now + delay
+        if retry:
+            redis_client.zadd(REVALIDATE_RETRY_KEY, retry)
+        if given_up:
+            _forget_retries(given_up)
             logger.error(
-                "fid-main revalidation returned HTTP %s for event_id=%s — "
-                "event is PUBLISHED in DB; fid-main will pick it up at next ISR tick.",
-                resp.status_code, event_id,
+                "fid-main revalidation gave up after %d attempts on %d path(s) %s — "
+                "fid-main will pick them up at next ISR tick.",
+                REVALIDATE_MAX_ATTEMPTS, len(given_up), given_up[:20],
             )
+        if retry:
+            logger.warning("fid-main revalidation: %d path(s) queued for retry", len(retry))
     except Exception as exc:
         logger.error(
-            "fid-main revalidation request failed for event_id=%s: %s — "
-            "event is PUBLISHED in DB; fid-main will pick it up at next ISR tick.",
-            event_id, exc,
+            "fid-main revalidation failed and %d path(s) could not be queued for retry: %s — "
+            "fid-main will pick them up at next ISR tick.",
+            len(paths), exc,
+        )
+
+
+async def flush_revalidations() -> None:
+    """
+    Send everything buffered plus any retries that are due, as one POST.
+
+    Never raises: network errors and 5xx/429 responses park the paths in the
+    retry queue, other 4xx (bad secret, bad payload) are logged and dropped.
+    """
+    async with _flush_lock:
+        await _flush()
+
+
+async def _flush() -> None:
+    fresh = list(_pending)
+    _pending.clear()
+    if not settings.REVALIDATE_SECRET:
+        return
+    retried = _due_retries()
+    paths = list(dict.fromkeys(fresh + retried))
+    if not paths:
+        return
+
+    try:
+        resp = await _get_client().post(
+            _FID_MAIN_REVALIDATE,
+            json={"paths": paths},
+            headers={"x-revalidate-secret": settings.REVALIDATE_SECRET},
         )
+    except Exception as exc:
+        logger.error("fid-main revalidation request failed for %d path(s): %s", len(paths), exc)
+        _schedule_retries(paths)
+        return
+
+    if resp.status_code == 200:
+        logger.info(
+            "fid-main revalidation triggered: %d path(s) (%d retried)",
+            len(paths), len(retried),
+        )
+        if retried:
+            _forget_retries(retried)
+    elif resp.status_code >= 500 or resp.status_code == 429:
+        logger.error("fid-main revalidation returned HTTP %s for %d path(s)", resp.status_code, len(paths))
+        _schedule_retries(paths)
+    else:
+        logger.error(
+            "fid-main revalidation returned HTTP %s for paths %s — not retrying; "
+            "fid-main will pick them up at next ISR tick.",
+            resp.status_code, paths[:20],
+        )
+        if retried:
+            _forget_retries(retried)
+
+
+async def close_revalidation() -> None:
+    """On shutdown: send the open window now, then close the shared client"""
+    global _client, _flush_task
+    if _flush_task is not None and not _flush_task.done():
+        _flush_task.cancel()
+    _flush_task = None
+    await flush_revalidations()
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+async def notify_fid_main_events_published(events: Iterable[Tuple[int, str]]) -> None:
+    """Queue revalidation of a batch of (event_id, title) just published (sent with the current window)."""
+    events = list(events)
+    if not events or _secret_missing([event_id for event_id, _ in events]):
+        return
+    request_revalidation(build_revalidate_paths(events))
+
+
+async def notify_fid_main_event_published(event_id: int, title: str) -> None:
+    """Queue revalidation of fid-main's pages after an event is published."""
+    await notify_fid_main_events_published([(event_id, title)])
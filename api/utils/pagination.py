@@ -0,0 +1,29 @@
+"""
+Opaque keyset cursors for event listings.
+
+A cursor encodes the (start_at, id) of the last row on a page. The next page
+is everything strictly after that pair in (start_at, id) order, which the
+ix_events_start_at_id index serves without scanning skipped rows.
+"""
+
+import base64
+import json
+from datetime import datetime
+from typing import Tuple
+
+from fastapi import HTTPException
+
+
+def encode_cursor(start_at: datetime, event_id: int) -> str:
+    raw = json.dumps([start_at.isoformat(), event_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Decode a cursor from encode_cursor(); raises 400 on anything malformed."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        start_at, event_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(start_at), int(event_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
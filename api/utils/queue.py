@@ -1,22 +1,116 @@
+import hashlib
+import os
+import time
 import redis
 import json
+from typing import TYPE_CHECKING, Tuple
 from config import settings
 
+if TYPE_CHECKING:
+    from models.task import Task
+
 redis_client = redis.from_url(settings.REDIS_URL, decode_responses=True)
 
-async def queue_extraction_task(task_id: int, url: str, source_type: str):
-    """Queue a task for the worker to process"""
-    task_data = {
-        "task_id": task_id,
-        "url": url,
-        "source_type": source_type
-    }
-    redis_client.lpush("extraction_queue", json.dumps(task_data))
-    return True
-
-def get_next_task():
-    """Get the next task from the queue (used by worker)"""
-    task_json = redis_client.rpop("extraction_queue")
-    if task_json:
-        return json.loads(task_json)
-    return None
+# Extraction lanes, highest priority first (must match worker/utils/task_queue.py)
+INTERACTIVE_LANE = "interactive"  # Admin URL extractions - a human is waiting
+SCHEDULED_LANE = "scheduled"      # Hourly and manual source syncs
+BACKFILL_LANE = "backfill"        # Full re-crawls
+LANE_KEYS = {
+    INTERACTIVE_LANE: "extraction_queue:interactive",
+    SCHEDULED_LANE: "extraction_queue",
+    BACKFILL_LANE: "extraction_queue:backfill",
+}
+READY_KEY = "extraction_queue:ready"  # Wakes idle workers
+READY_MAX_TOKENS = 100
+
+def push_task(task_data: dict, lane: str = SCHEDULED_LANE):
+    """LPUSH a task onto its lane and wake a worker"""
+    pipe = redis_client.pipeline()
+    pipe.lpush(LANE_KEYS[lane], json.dumps({**task_data, "lane": lane}))
+    pipe.lpush(READY_KEY, 1)
+    pipe.ltrim(READY_KEY, 0, READY_MAX_TOKENS - 1)
+    pipe.execute()
+
+# Marks the task currently queued or running for a (source_type, url); the
+# worker deletes it when the task finishes (key format must match
+# worker/utils/task_queue.py). The TTL only cleans up after lost tasks.
+ACTIVE_TASK_KEY_PREFIX = "extraction_queue:active:"
+ACTIVE_TASK_TTL = int(os.getenv("ACTIVE_TASK_TTL", str(6 * 3600)))
+# A marker is set just before its Task row commits: for this long a marker
+# whose row is not visible yet belongs to an enqueue still in flight
+ACTIVE_TASK_CLAIM_GRACE = 10
+
+def active_task_key(source_type: str, url: str) -> str:
+    digest = hashlib.sha1(f"{source_type}\n{url}".encode()).hexdigest()
+    return ACTIVE_TASK_KEY_PREFIX + digest
+
+def _clear_stale_marker(key: str, task_id: str):
+    """Drop a marker left by a task that already finished, unless it was replaced meanwhile"""
+    with redis_client.pipeline() as pipe:
+        try:
+            pipe.watch(key)
+            if pipe.get(key) == task_id:
+                pipe.multi()
+                pipe.delete(key)
+                pipe.execute()
+        except redis.WatchError:
+            pass
+
+def enqueue_task(db, url: str, source_type: str, lane: str = SCHEDULED_LANE) -> Tuple["Task", bool]:
+    """
+    Create the Task row for (source_type, url) and queue it - unless one is
+    already queued or running, so repeated triggers never multiply crawls
+
+    Blocking (it may wait up to ACTIVE_TASK_CLAIM_GRACE for a concurrent
+    enqueue to commit): call it from a sync route or a worker thread.
+
+    Returns:
+        (task, created) - created is False when the existing task is returned
+    """
+    from models.task import Task
+    
+    key = active_task_key(source_type, url)
+    wait_until = time.monotonic() + ACTIVE_TASK_CLAIM_GRACE
+    attempts = 0
+    while attempts < 3:
+        active_id = redis_client.get(key)
+        if active_id:
+            active = db.get(Task, int(active_id))
+            if active is None and ACTIVE_TASK_TTL - redis_client.ttl(key) < ACTIVE_TASK_CLAIM_GRACE:
+                # Another enqueue holds the marker and has not committed its row yet
+                if time.monotonic() < wait_until:
+                    time.sleep(0.05)
+                    continue
+                raise RuntimeError(f"Could not queue {source_type} {url}: active task #{active_id} not committed")
+            if active and active.status in ("queued", "running"):
+                return active, False
+            _clear_stale_marker(key, active_id)
+        
+        attempts += 1
+        task = Task(url=url, source_type=source_type, status="queued")
+        db.add(task)
+        # Assigns the id. The row is invisible to other sessions until the
+        # commit below, so a concurrent enqueue can find the marker before
+        # the row - it waits (above) rather than treating the marker as stale
+        db.flush()
+        if redis_client.set(key, task.id, nx=True, ex=ACTIVE_TASK_TTL):
+            db.commit()
+            db.refresh(task)
+            try:
+                push_task({"task_id": task.id, "url": url, "source_type": source_type}, lane)
+            except Exception as e:
+                # Never leave a marker pointing at a task no worker will see
+                redis_client.delete(key)
+                task.status = "failed"
+                task.error_message = f"Could not queue task: {e}"
+                db.commit()
+                raise
+            return task, True
+        # Another request claimed this source first - return its task instead
+        db.rollback()
+    
+    raise RuntimeError(f"Could not queue {source_type} {url}: active-task marker kept changing")
+
+def enqueue_source_sync(db, source, lane: str = SCHEDULED_LANE) -> Tuple["Task", bool]:
+    """enqueue_task for a registered source's sync"""
+    return enqueue_task(db, source.url, source.task_source_type, lane)
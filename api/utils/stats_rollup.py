@@ -0,0 +1,73 @@
+"""
+Materialized dashboard stats.
+
+stats_rollup is a one-row materialized view holding every number that
+GET /api/stats returns. The scheduler refreshes it after publish/cleanup
+runs and, at most once a minute, after worker tasks complete, so the stats
+endpoint is a single primary-key read no matter how large events and tasks
+grow.
+
+REFRESH ... CONCURRENTLY (backed by the unique index on id) keeps the
+view readable while it is being rebuilt.
+"""
+
+from typing import Any, Dict, Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+CREATE_STATS_ROLLUP_SQL = """
+CREATE MATERIALIZED VIEW IF NOT EXISTS stats_rollup AS
+SELECT
+    1 AS id,
+    now() AS computed_at,
+    (SELECT count(*) FROM events) AS total_events,
+    (SELECT count(*) FROM events WHERE created_at >= now() - interval '7 days') AS events_this_week,
+    (SELECT count(*) FROM tasks) AS total_extractions,
+    (SELECT count(*) FROM sources WHERE lower(status::text) = 'active') AS active_sources,
+    (SELECT count(*) FROM tasks WHERE status = 'failed') AS failed_tasks,
+    (SELECT count(*) FROM tasks WHERE status = 'done') AS done_tasks,
+    (
+        SELECT coalesce(json_agg(json_build_object('url', source_url, 'count', n) ORDER BY n DESC), '[]')
+        FROM (
+            SELECT source_url, count(*) AS n FROM events
+            GROUP BY source_url ORDER BY n DESC LIMIT 5
+        ) s
+    ) AS top_sources,
+    (
+        SELECT coalesce(json_object_agg(status, n), '{}')
+        FROM (SELECT status, count(*) AS n FROM events GROUP BY status) s
+    ) AS events_by_status,
+    (
+        SELECT coalesce(json_agg(json_build_object('city', city, 'count', n) ORDER BY n DESC), '[]')
+        FROM (
+            SELECT city, count(*) AS n FROM events WHERE city IS NOT NULL
+            GROUP BY city ORDER BY n DESC LIMIT 10
+        ) s
+    ) AS events_by_city,
+    (
+        SELECT coalesce(json_agg(json_build_object(
+            'task_id', id, 'url', url, 'error', error_message, 'timestamp', updated_at
+        ) ORDER BY updated_at DESC NULLS LAST), '[]')
+        FROM (
+            SELECT id, url, error_message, updated_at FROM tasks WHERE status = 'failed'
+            ORDER BY updated_at DESC NULLS LAST LIMIT 5
+        ) s
+    ) AS recent_errors
+"""
+
+CREATE_STATS_ROLLUP_INDEX_SQL = "CREATE UNIQUE INDEX IF NOT EXISTS ix_stats_rollup_id ON stats_rollup (id)"
+
+REFRESH_STATS_ROLLUP_SQL = "REFRESH MATERIALIZED VIEW CONCURRENTLY stats_rollup"
+
+
+def refresh_stats_rollup(db: Session) -> None:
+    """Recompute the rollup (commits)."""
+    db.execute(text(REFRESH_STATS_ROLLUP_SQL))
+    db.commit()
+
+
+def read_stats_rollup(db: Session) -> Optional[Dict[str, Any]]:
+    """The current rollup row as a dict, or None if it has never been built."""
+    row = db.execute(text("SELECT * FROM stats_rollup WHERE id = 1")).mappings().first()
+    return dict(row) if row else None
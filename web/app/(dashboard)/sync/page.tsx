@@ -93,7 +93,7 @@ export default function BulkSyncPage() {
     try {
       const token = localStorage.getItem('token')
       const apiUrl = process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8001'
-      const response = await fetch(`${apiUrl}/api/sync/eventbrite/dallas`, {
+      const response = await fetch(`${apiUrl}/api/sync/eventbrite`, {
         method: 'POST',
         headers: {
           'Authorization': `Bearer ${token}`,
@@ -4,19 +4,22 @@ Extracts kids and family-friendly events from Dallas Arboretum
 """
 
 import json
-import requests
 from bs4 import BeautifulSoup
 from datetime import datetime
 from dateutil import parser as date_parser
 from typing import List, Dict, Optional
 
+from utils.fetcher import fetch_all
+from utils.http_cache import fetch_parsed
+from utils.http_client import HttpClient, get_http_client
 from utils.timezone import ensure_utc
 
 
 class DallasArboretumExtractor:
     """Extract events from Dallas Arboretum & Botanical Garden"""
     
-    def __init__(self):
+    def __init__(self, http: Optional[HttpClient] = None):
+        self.http = http or get_http_client()
         self.base_url = 'https://www.dallasarboretum.org'
         self.calendar_url = f'{self.base_url}/events-activities/calendar/'
         self.events_url = f'{self.base_url}/events-activities/'
@@ -44,13 +47,7 @@ class DallasArboretumExtractor:
             
             # Step 2: Fetch details for each event (limit to prevent overload)
             max_events = 50  # Reasonable limit
-            events = []
-            
-            for i, url in enumerate(event_urls[:max_events], 1):
-                print(f"   [{i}/{min(len(event_urls), max_events)}] Fetching: {url.split('/')[-2]}...")
-                event_data = self._fetch_event_details(url)
-                if event_data:
-                    events.append(event_data)
+            events = fetch_all(event_urls[:max_events], self._fetch_event_details)
             
             print(f"✅ Successfully parsed {len(events)} Dallas Arboretum events")
             return events
@@ -67,38 +64,33 @@ class DallasArboretumExtractor:
             List of event detail page URLs
         """
         try:
-            response = requests.get(
-                self.calendar_url,
-                timeout=30,
-                headers={
-                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-                }
-            )
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # Find all "Learn More" links to event detail pages
-            event_urls = set()  # Use set to avoid duplicates
-            
-            # Look for links containing /event/ in the href
-            event_links = soup.find_all('a', href=lambda x: x and '/event/' in x)
-            
-            for link in event_links:
-                href = link.get('href')
-                # Make absolute URL if relative
-                if href.startswith('/'):
-                    href = self.base_url + href
-                # Only add if it's an event detail page
-                if '/event/' in href and href not in event_urls:
-                    event_urls.add(href)
-            
-            return list(event_urls)
+            return fetch_parsed(self.calendar_url, self._extract_event_urls, cache_as='listing', timeout=30, client=self.http)
             
         except Exception as e:
             print(f"⚠️  Error scraping calendar: {e}")
             return []
     
+    def _extract_event_urls(self, html: str) -> List[str]:
+        """Extract event detail page URLs from the listing page"""
+        soup = BeautifulSoup(html, 'html.parser')
+        
+        # Find all "Learn More" links to event detail pages
+        event_urls = set()  # Use set to avoid duplicates
+        
+        # Look for links containing /event/ in the href
+        event_links = soup.find_all('a', href=lambda x: x and '/event/' in x)
+        
+        for link in event_links:
+            href = link.get('href')
+            # Make absolute URL if relative
+            if href.startswith('/'):
+                href = self.base_url + href
+            # Only add if it's an event detail page
+            if '/event/' in href and href not in event_urls:
+                event_urls.add(href)
+        
+        return list(event_urls)
+    
     def _fetch_event_details(self, url: str) -> Optional[Dict]:
         """
         Fetch full event details from an individual event page
@@ -110,42 +102,42 @@ class DallasArboretumExtractor:
             Parsed event dictionary or None
         """
         try:
-            response = requests.get(
+            return fetch_parsed(
                 url,
+                lambda html: self._parse_event_page(html, url),
+                cache_as='detail',
                 timeout=15,
-                headers={
-                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-                }
+                client=self.http,
             )
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # Find JSON-LD data (most reliable)
-            json_ld_scripts = soup.find_all('script', type='application/ld+json')
-            
-            for script in json_ld_scripts:
-                try:
-                    data = json.loads(script.string)
-                    
-                    # Handle both single objects and arrays
-                    items = data if isinstance(data, list) else [data]
-                    
-                    for item in items:
-                        # Check if it's an Event type
-                        item_type = item.get('@type', '')
-                        if item_type == 'Event' or (isinstance(item_type, list) and 'Event' in item_type):
-                            return self._parse_event(item)
-                
-                except json.JSONDecodeError:
-                    continue
-            
-            return None
-            
         except Exception as e:
             print(f"      ⚠️  Error fetching {url}: {str(e)[:50]}")
             return None
     
+    def _parse_event_page(self, html: str, url: str) -> Optional[Dict]:
+        """Parse an event detail page"""
+        soup = BeautifulSoup(html, 'html.parser')
+        
+        # Find JSON-LD data (most reliable)
+        json_ld_scripts = soup.find_all('script', type='application/ld+json')
+        
+        for script in json_ld_scripts:
+            try:
+                data = json.loads(script.string)
+                
+                # Handle both single objects and arrays
+                items = data if isinstance(data, list) else [data]
+                
+                for item in items:
+                    # Check if it's an Event type
+                    item_type = item.get('@type', '')
+                    if item_type == 'Event' or (isinstance(item_type, list) and 'Event' in item_type):
+                        return self._parse_event(item)
+            
+            except json.JSONDecodeError:
+                continue
+        
+        return None
+    
     def _parse_event(self, data: Dict) -> Optional[Dict]:
         """Parse a single JSON-LD Event object from Dallas Arboretum"""
         try:
@@ -291,14 +283,14 @@ class DallasArboretumExtractor:
             return 'Family & Kids'
 
 
-def extract_dallas_arboretum_events() -> List[Dict]:
+def extract_dallas_arboretum_events(http: Optional[HttpClient] = None) -> List[Dict]:
     """
     Main function to extract Dallas Arboretum events
     
     Returns:
         List of parsed events
     """
-    extractor = DallasArboretumExtractor()
+    extractor = DallasArboretumExtractor(http)
     return extractor.fetch_events()
 
 
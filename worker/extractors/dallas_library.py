@@ -4,20 +4,23 @@ Extracts FREE educational and family-friendly events
 """
 
 import json
-import requests
 from bs4 import BeautifulSoup
 from datetime import datetime
 from dateutil import parser as date_parser
 from typing import List, Dict, Optional
 import re
 
+from utils.fetcher import fetch_all
+from utils.http_cache import fetch_parsed
+from utils.http_client import HttpClient, get_http_client
 from utils.timezone import ensure_utc
 
 
 class DallasLibraryExtractor:
     """Extract events from Dallas Public Library"""
     
-    def __init__(self):
+    def __init__(self, http: Optional[HttpClient] = None):
+        self.http = http or get_http_client()
         self.base_url = 'https://dallaslibrary.librarymarket.com'
         self.events_url = f'{self.base_url}/events/upcoming'
     
@@ -31,30 +34,19 @@ class DallasLibraryExtractor:
         print(f"📚 Fetching Dallas Public Library events...")
         
         try:
-            response = requests.get(
+            # Find all event links
+            event_urls = fetch_parsed(
                 self.events_url,
+                lambda html: self._extract_event_urls(BeautifulSoup(html, 'html.parser')),
+                cache_as='listing',
                 timeout=30,
-                headers={
-                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-                }
+                client=self.http,
             )
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # Find all event links
-            event_urls = self._extract_event_urls(soup)
             print(f"📅 Found {len(event_urls)} events")
             
             # Fetch details for each event (limit to prevent overload)
             max_events = 50  # Libraries have LOTS of events
-            events = []
-            
-            for i, url in enumerate(event_urls[:max_events], 1):
-                print(f"   [{i}/{min(len(event_urls), max_events)}] Fetching: {url.split('/')[-1][:40]}...")
-                event_data = self._fetch_event_details(url)
-                if event_data:
-                    events.append(event_data)
+            events = fetch_all(event_urls[:max_events], self._fetch_event_details)
             
             print(f"✅ Successfully parsed {len(events)} Dallas Public Library events")
             return events
@@ -82,18 +74,22 @@ class DallasLibraryExtractor:
     def _fetch_event_details(self, url: str) -> Optional[Dict]:
         """Fetch full event details from an individual event page"""
         try:
-            response = requests.get(url, timeout=15, headers={
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            })
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
-            return self._parse_event(soup, url)
-            
+            return fetch_parsed(
+                url,
+                lambda html: self._parse_event_page(html, url),
+                cache_as='detail',
+                timeout=15,
+                client=self.http,
+            )
         except Exception as e:
             print(f"      ⚠️  Error: {str(e)[:50]}")
             return None
     
+    def _parse_event_page(self, html: str, url: str) -> Optional[Dict]:
+        """Parse an event detail page"""
+        soup = BeautifulSoup(html, 'html.parser')
+        return self._parse_event(soup, url)
+    
     def _parse_event(self, soup: BeautifulSoup, url: str) -> Optional[Dict]:
         """Parse event details from HTML"""
         try:
@@ -308,9 +304,9 @@ class DallasLibraryExtractor:
             return 'Community & Culture'
 
 
-def extract_dallas_library_events() -> List[Dict]:
+def extract_dallas_library_events(http: Optional[HttpClient] = None) -> List[Dict]:
     """Main function to extract Dallas Public Library events"""
-    extractor = DallasLibraryExtractor()
+    extractor = DallasLibraryExtractor(http)
     return extractor.fetch_events()
 
 
@@ -1,8 +1,9 @@
 import os
-import requests
 from datetime import datetime
 from dateutil import parser as date_parser
 
+from utils.http_client import get_http_client
+
 def extract_eventbrite_events(url_or_query):
     """
     Extract events from Eventbrite using their official API
@@ -86,7 +87,7 @@ def get_event_by_id(event_id, api_token):
         'expand': 'venue,organizer,ticket_availability'
     }
     
-    response = requests.get(url, params=params, timeout=10)
+    response = get_http_client().get(url, params=params, timeout=10)
     response.raise_for_status()
     
     event_data = response.json()
@@ -104,7 +105,7 @@ def get_events_by_organizer(org_id, api_token, max_events=50):
         'order_by': 'start_asc'
     }
     
-    response = requests.get(url, params=params, timeout=10)
+    response = get_http_client().get(url, params=params, timeout=10)
     response.raise_for_status()
     
     data = response.json()
@@ -4,18 +4,22 @@ Extracts music and entertainment events
 """
 
 import json
-import requests
 from bs4 import BeautifulSoup
 from datetime import datetime
 from dateutil import parser as date_parser
 from typing import List, Dict, Optional
 import re
 
+from utils.fetcher import fetch_all
+from utils.http_cache import fetch_parsed
+from utils.http_client import HttpClient, get_http_client
+
 
 class FactoryDeepEllumExtractor:
     """Extract events from The Factory in Deep Ellum"""
     
-    def __init__(self):
+    def __init__(self, http: Optional[HttpClient] = None):
+        self.http = http or get_http_client()
         self.base_url = 'https://thefactorydeepellum.com'
         self.events_url = f'{self.base_url}/events'
     
@@ -29,28 +33,18 @@ class FactoryDeepEllumExtractor:
         print(f"🏭 Fetching The Factory in Deep Ellum events...")
         
         try:
-            response = requests.get(
+            # Find all event links
+            event_urls = fetch_parsed(
                 self.events_url,
+                lambda html: self._extract_event_urls(BeautifulSoup(html, 'html.parser')),
+                cache_as='listing',
                 timeout=30,
-                headers={
-                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-                }
+                client=self.http,
             )
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # Find all event links
-            event_urls = self._extract_event_urls(soup)
             print(f"📅 Found {len(event_urls)} events")
             
             # Fetch details for each event
-            events = []
-            for i, url in enumerate(event_urls[:50], 1):  # Limit to 50
-                print(f"   [{i}/{min(len(event_urls), 50)}] Fetching: {url.split('/')[-1][:40]}...")
-                event_data = self._fetch_event_details(url)
-                if event_data:
-                    events.append(event_data)
+            events = fetch_all(event_urls[:50], self._fetch_event_details)  # Limit to 50
             
             print(f"✅ Successfully parsed {len(events)} Factory events")
             return events
@@ -92,33 +86,37 @@ class FactoryDeepEllumExtractor:
     def _fetch_event_details(self, url: str) -> Optional[Dict]:
         """Fetch full event details from an individual event page"""
         try:
-            response = requests.get(url, timeout=15, headers={
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            })
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # Try JSON-LD first
-            json_ld_scripts = soup.find_all('script', type='application/ld+json')
-            for script in json_ld_scripts:
-                try:
-                    data = json.loads(script.string)
-                    items = data if isinstance(data, list) else [data]
-                    
-                    for item in items:
-                        if item.get('@type') in ['MusicEvent', 'Event']:
-                            return self._parse_json_ld_event(item, url)
-                except:
-                    continue
-            
-            # Fallback to HTML parsing
-            return self._parse_html_event(soup, url)
-            
+            return fetch_parsed(
+                url,
+                lambda html: self._parse_event_page(html, url),
+                cache_as='detail',
+                timeout=15,
+                client=self.http,
+            )
         except Exception as e:
             print(f"      ⚠️  Error: {str(e)[:50]}")
             return None
     
+    def _parse_event_page(self, html: str, url: str) -> Optional[Dict]:
+        """Parse an event detail page"""
+        soup = BeautifulSoup(html, 'html.parser')
+        
+        # Try JSON-LD first
+        json_ld_scripts = soup.find_all('script', type='application/ld+json')
+        for script in json_ld_scripts:
+            try:
+                data = json.loads(script.string)
+                items = data if isinstance(data, list) else [data]
+                
+                for item in items:
+                    if item.get('@type') in ['MusicEvent', 'Event']:
+                        return self._parse_json_ld_event(item, url)
+            except:
+                continue
+        
+        # Fallback to HTML parsing
+        return self._parse_html_event(soup, url)
+    
     def _parse_json_ld_event(self, data: Dict, url: str) -> Optional[Dict]:
         """Parse event from JSON-LD data"""
         try:
@@ -260,7 +258,7 @@ class FactoryDeepEllumExtractor:
             return None
 
 
-def extract_factory_deep_ellum_events():
+def extract_factory_deep_ellum_events(http: Optional[HttpClient] = None):
     """Helper function for worker.py"""
-    extractor = FactoryDeepEllumExtractor()
+    extractor = FactoryDeepEllumExtractor(http)
     return extractor.fetch_events()
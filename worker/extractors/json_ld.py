@@ -1,45 +1,46 @@
 import json
-import requests
 from bs4 import BeautifulSoup
 from datetime import datetime
 from dateutil import parser as date_parser
 
-def extract_json_ld(url):
+from utils.http_cache import fetch_parsed
+
+def extract_json_ld(url, http=None):
     """Extract event data from JSON-LD structured data"""
-    events = []
-    
     try:
-        response = requests.get(url, timeout=10, headers={
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        })
-        response.raise_for_status()
-        
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        # Find all JSON-LD scripts
-        json_ld_scripts = soup.find_all('script', type='application/ld+json')
-        
-        for script in json_ld_scripts:
-            try:
-                data = json.loads(script.string)
-                
-                # Handle both single objects and arrays
-                items = data if isinstance(data, list) else [data]
-                
-                for item in items:
-                    # Check if it's an Event type
-                    item_type = item.get('@type', '')
-                    if item_type == 'Event' or (isinstance(item_type, list) and 'Event' in item_type):
-                        event = parse_json_ld_event(item)
-                        if event:
-                            events.append(event)
-            
-            except json.JSONDecodeError:
-                continue
-    
+        return fetch_parsed(url, _parse_json_ld_page, cache_as='json_ld', timeout=10, client=http)
     except Exception as e:
         print(f"Error extracting JSON-LD from {url}: {e}")
     
+    return []
+
+def _parse_json_ld_page(html):
+    """Find every JSON-LD Event in a page"""
+    events = []
+    
+    soup = BeautifulSoup(html, 'html.parser')
+    
+    # Find all JSON-LD scripts
+    json_ld_scripts = soup.find_all('script', type='application/ld+json')
+    
+    for script in json_ld_scripts:
+        try:
+            data = json.loads(script.string)
+            
+            # Handle both single objects and arrays
+            items = data if isinstance(data, list) else [data]
+            
+            for item in items:
+                # Check if it's an Event type
+                item_type = item.get('@type', '')
+                if item_type == 'Event' or (isinstance(item_type, list) and 'Event' in item_type):
+                    event = parse_json_ld_event(item)
+                    if event:
+                        events.append(event)
+        
+        except json.JSONDecodeError:
+            continue
+    
     return events
 
 def parse_json_ld_event(data):
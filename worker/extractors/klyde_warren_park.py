@@ -4,20 +4,23 @@ Extracts family-friendly events from Klyde Warren Park
 """
 
 import json
-import requests
 from bs4 import BeautifulSoup
 from datetime import datetime
 from dateutil import parser as date_parser
 from typing import List, Dict, Optional
 import re
 
+from utils.fetcher import fetch_all
+from utils.http_cache import fetch_parsed
+from utils.http_client import HttpClient, get_http_client
 from utils.timezone import ensure_utc
 
 
 class KlydeWarrenParkExtractor:
     """Extract events from Klyde Warren Park"""
     
-    def __init__(self):
+    def __init__(self, http: Optional[HttpClient] = None):
+        self.http = http or get_http_client()
         self.base_url = 'https://www.klydewarrenpark.org'
         self.events_url = f'{self.base_url}/events-programming'
         
@@ -45,13 +48,7 @@ class KlydeWarrenParkExtractor:
             
             # Step 2: Fetch details for each event (limit to prevent overload)
             max_events = 50  # Reasonable limit
-            events = []
-            
-            for i, url in enumerate(event_urls[:max_events], 1):
-                print(f"   [{i}/{min(len(event_urls), max_events)}] Fetching: {url.split('/')[-1][:40]}...")
-                event_data = self._fetch_event_details(url)
-                if event_data:
-                    events.append(event_data)
+            events = fetch_all(event_urls[:max_events], self._fetch_event_details)
             
             print(f"✅ Successfully parsed {len(events)} Klyde Warren Park events")
             return events
@@ -68,40 +65,35 @@ class KlydeWarrenParkExtractor:
             List of event detail page URLs
         """
         try:
-            response = requests.get(
-                self.events_url,
-                timeout=30,
-                headers={
-                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-                }
-            )
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # Find all event links
-            event_urls = set()  # Use set to avoid duplicates
-            
-            # Look for links containing /events-programming/ in the href
-            event_links = soup.find_all('a', href=lambda x: x and '/events-programming/' in x and x != '/events-programming')
-            
-            for link in event_links:
-                href = link.get('href')
-                # Make absolute URL if relative
-                if href.startswith('/'):
-                    href = self.base_url + href
-                # Only add if it's an event detail page (not the main listing)
-                if '/events-programming/' in href and href != self.events_url:
-                    # Remove query parameters and fragments
-                    href = href.split('?')[0].split('#')[0]
-                    event_urls.add(href)
-            
-            return list(event_urls)
+            return fetch_parsed(self.events_url, self._extract_event_urls, cache_as='listing', timeout=30, client=self.http)
             
         except Exception as e:
             print(f"⚠️  Error scraping events page: {e}")
             return []
     
+    def _extract_event_urls(self, html: str) -> List[str]:
+        """Extract event detail page URLs from the listing page"""
+        soup = BeautifulSoup(html, 'html.parser')
+        
+        # Find all event links
+        event_urls = set()  # Use set to avoid duplicates
+        
+        # Look for links containing /events-programming/ in the href
+        event_links = soup.find_all('a', href=lambda x: x and '/events-programming/' in x and x != '/events-programming')
+        
+        for link in event_links:
+            href = link.get('href')
+            # Make absolute URL if relative
+            if href.startswith('/'):
+                href = self.base_url + href
+            # Only add if it's an event detail page (not the main listing)
+            if '/events-programming/' in href and href != self.events_url:
+                # Remove query parameters and fragments
+                href = href.split('?')[0].split('#')[0]
+                event_urls.add(href)
+        
+        return list(event_urls)
+    
     def _fetch_event_details(self, url: str) -> Optional[Dict]:
         """
         Fetch full event details from an individual event page
@@ -113,26 +105,26 @@ class KlydeWarrenParkExtractor:
             Parsed event dictionary or None
         """
         try:
-            response = requests.get(
+            return fetch_parsed(
                 url,
+                lambda html: self._parse_event_page(html, url),
+                cache_as='detail',
                 timeout=15,
-                headers={
-                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-                }
+                client=self.http,
             )
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # Try to parse from structured data first
-            event_data = self._parse_from_html(soup, url)
-            
-            return event_data
-            
         except Exception as e:
             print(f"      ⚠️  Error fetching {url}: {str(e)[:50]}")
             return None
     
+    def _parse_event_page(self, html: str, url: str) -> Optional[Dict]:
+        """Parse an event detail page"""
+        soup = BeautifulSoup(html, 'html.parser')
+        
+        # Try to parse from structured data first
+        event_data = self._parse_from_html(soup, url)
+        
+        return event_data
+    
     def _parse_from_html(self, soup: BeautifulSoup, url: str) -> Optional[Dict]:
         """
         Parse event details from HTML
@@ -299,14 +291,14 @@ class KlydeWarrenParkExtractor:
             return 'Other'
 
 
-def extract_klyde_warren_park_events() -> List[Dict]:
+def extract_klyde_warren_park_events(http: Optional[HttpClient] = None) -> List[Dict]:
     """
     Main function to extract Klyde Warren Park events
     
     Returns:
         List of event dictionaries
     """
-    extractor = KlydeWarrenParkExtractor()
+    extractor = KlydeWarrenParkExtractor(http)
     return extractor.fetch_events()
 
 
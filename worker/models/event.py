@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Enum, Numeric
+from sqlalchemy import Column, Integer, String, Text, DateTime, Enum, Numeric, JSON
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.sql import func
 from sqlalchemy.dialects.postgresql import ENUM
@@ -38,11 +38,15 @@ class Event(Base):
     price_tier = Column(ENUM('FREE', 'PAID', 'DONATION', name='pricetier', create_type=True), default="FREE")
     price_amount = Column(Numeric(10, 2))
     image_url = Column(String)
+    image_variants = Column(JSON)
     source_url = Column(String, nullable=False)
     source_type = Column(ENUM('FACEBOOK', 'FACEBOOK_BULK', 'EVENTBRITE', 'EVENTBRITE_BULK', 'INSTAGRAM', 'WEBPAGE', 'ICS', 'RSS', 'MANUAL', 'facebook_bulk', 'eventbrite', 'eventbrite_bulk', 'DALLAS_ARBORETUM', 'dallas_arboretum', 'KLYDE_WARREN_PARK', 'PEROT_MUSEUM', 'DALLAS_LIBRARY', 'DALLAS_ZOO', 'FAIR_PARK', name='sourcetype', create_type=True), nullable=False)
     category = Column(String, index=True)
     fid_hash = Column(String, unique=True, index=True, nullable=False)
+    content_hash = Column(String)  # Fingerprint of the extracted source data
+    edited_at = Column(DateTime(timezone=True))  # Set by the API on CMS edits - the crawl no longer owns the row
     status = Column(ENUM('DRAFT', 'PUBLISHED', name='eventstatus', create_type=True), default="DRAFT", nullable=False, index=True)
+    duplicate_of_id = Column(Integer)  # Set by the API's cross-source dedup
     wp_post_id = Column(Integer)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
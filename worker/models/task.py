@@ -30,6 +30,9 @@ class Task(Base):
     logs = Column(Text)
     error_message = Column(Text)
     events_extracted = Column(Integer, default=0)
+    # Crawl fingerprint outcome: events that were new/updated vs. identical to the last run
+    events_changed = Column(Integer, default=0)
+    events_unchanged = Column(Integer, default=0)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     completed_at = Column(DateTime(timezone=True))
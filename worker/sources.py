@@ -0,0 +1,57 @@
+"""
+Source Registry
+One entry per bulk sync source: which extractor runs for a queued task, the
+source_type its events are saved under and how many of its tasks may run at
+once. The API has the matching registry (api/sources.py) for endpoints,
+schedules and freshness - keep name/task_source_type/url in sync.
+"""
+
+import importlib
+from typing import Dict, List, NamedTuple, Optional
+
+
+class Source(NamedTuple):
+    name: str               # Registry key, shared with api/sources.py
+    task_source_type: str   # tasks.source_type of queued syncs
+    url: str                # Pseudo-URL the sync is queued with (events' source_url)
+    extractor: str          # "module:function", imported when the first task runs
+    event_source_type: str  # events.source_type of what it extracts
+    accepts_http: bool = True  # Extractor takes the task's HttpClient
+    max_concurrency: int = 1   # Tasks of this source running at once, across the worker's slots
+
+
+SOURCES: List[Source] = [
+    Source("eventbrite", "eventbrite_bulk", "bulk:eventbrite:dallas",
+           "extractors.bulk_eventbrite:bulk_sync_eventbrite_dallas", "eventbrite",
+           accepts_http=False),
+    Source("dallas_arboretum", "dallas_arboretum_bulk", "bulk:dallas_arboretum",
+           "extractors.dallas_arboretum:extract_dallas_arboretum_events", "DALLAS_ARBORETUM"),
+    Source("klyde_warren_park", "klyde_warren_park_bulk", "bulk:klyde_warren_park",
+           "extractors.klyde_warren_park:extract_klyde_warren_park_events", "KLYDE_WARREN_PARK"),
+    Source("perot_museum", "perot_museum_bulk", "bulk:perot_museum",
+           "extractors.perot_museum:extract_perot_museum_events", "PEROT_MUSEUM"),
+    Source("dallas_library", "dallas_library_bulk", "bulk:dallas_library",
+           "extractors.dallas_library:extract_dallas_library_events", "DALLAS_LIBRARY"),
+    Source("dallas_zoo", "dallas_zoo_bulk", "bulk:dallas_zoo",
+           "extractors.dallas_zoo:extract_dallas_zoo_events", "DALLAS_ZOO"),
+    Source("fair_park", "fair_park_bulk", "bulk:fair_park",
+           "extractors.fair_park:extract_fair_park_events", "FAIR_PARK"),
+    Source("house_of_blues", "house_of_blues_bulk", "bulk:house_of_blues",
+           "extractors.house_of_blues:extract_house_of_blues_events", "HOUSE_OF_BLUES"),
+    Source("factory_deep_ellum", "factory_deep_ellum_bulk", "bulk:factory_deep_ellum",
+           "extractors.factory_deep_ellum:extract_factory_deep_ellum_events", "FACTORY_DEEP_ELLUM"),
+]
+
+SOURCES_BY_TASK_TYPE: Dict[str, Source] = {source.task_source_type: source for source in SOURCES}
+
+
+def source_for_task(task_source_type: str) -> Optional[Source]:
+    """Registered source for a queued task's source_type, or None for ad-hoc URL tasks"""
+    return SOURCES_BY_TASK_TYPE.get(task_source_type)
+
+
+def run_extractor(source: Source, http=None) -> List[Dict]:
+    """Import and call the source's extractor"""
+    module_name, function_name = source.extractor.split(":")
+    extract = getattr(importlib.import_module(module_name), function_name)
+    return extract(http) if source.accepts_http else extract()
@@ -0,0 +1,93 @@
+"""
+Concurrent Detail Fetcher
+Runs an extractor's per-URL fetch function across a bounded thread pool,
+with a per-host concurrency cap and a politeness delay between requests
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, List, Optional
+from urllib.parse import urlparse
+
+# Total detail pages fetched at once by a single extractor run
+DETAIL_FETCH_WORKERS = max(1, int(os.getenv("DETAIL_FETCH_WORKERS", "8")))
+# Max in-flight requests to one host (shared by every task in this worker)
+PER_HOST_CONCURRENCY = max(1, int(os.getenv("PER_HOST_CONCURRENCY", "4")))
+# Minimum gap (seconds) between request starts to the same host
+POLITENESS_DELAY = float(os.getenv("POLITENESS_DELAY", "0.25"))
+
+
+class HostGate:
+    """Limits concurrent requests to one host and spaces out their start times"""
+
+    def __init__(self, limit: int, delay: float):
+        self._semaphore = threading.BoundedSemaphore(limit)
+        self._lock = threading.Lock()
+        self._delay = delay
+        self._next_start = 0.0
+
+    def __enter__(self):
+        self._semaphore.acquire()
+        with self._lock:
+            now = time.monotonic()
+            start_at = max(now, self._next_start)
+            self._next_start = start_at + self._delay
+        wait = start_at - now
+        if wait > 0:
+            time.sleep(wait)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._semaphore.release()
+        return False
+
+
+_gates: Dict[str, HostGate] = {}
+_gates_lock = threading.Lock()
+
+
+def host_gate(url: str) -> HostGate:
+    """Get the shared gate for a URL's host"""
+    host = urlparse(url).netloc.lower()
+    with _gates_lock:
+        gate = _gates.get(host)
+        if gate is None:
+            gate = HostGate(PER_HOST_CONCURRENCY, POLITENESS_DELAY)
+            _gates[host] = gate
+        return gate
+
+
+def fetch_all(urls: List[str], fetch_fn: Callable[[str], Optional[Dict]]) -> List[Dict]:
+    """
+    Call fetch_fn for every URL concurrently
+
+    Args:
+        urls: Detail page URLs
+        fetch_fn: Extractor method that fetches and parses one URL
+
+    Returns:
+        Non-empty results, in the same order as urls
+    """
+    if not urls:
+        return []
+
+    def run(url: str) -> Optional[Dict]:
+        with host_gate(url):
+            return fetch_fn(url)
+
+    results: List[Optional[Dict]] = [None] * len(urls)
+    workers = min(DETAIL_FETCH_WORKERS, len(urls))
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="fetch") as pool:
+        futures = {pool.submit(run, url): i for i, url in enumerate(urls)}
+        for done, future in enumerate(as_completed(futures), 1):
+            i = futures[future]
+            try:
+                results[i] = future.result()
+            except Exception as e:
+                print(f"      ⚠️  Error fetching {urls[i]}: {str(e)[:50]}")
+            print(f"   [{done}/{len(urls)}] Fetched: {urls[i].rstrip('/').split('/')[-1][:40]}")
+
+    return [r for r in results if r]
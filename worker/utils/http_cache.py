@@ -0,0 +1,137 @@
+"""
+Conditional HTTP Cache
+Fetches pages with If-None-Match / If-Modified-Since and reuses the stored
+body - and the previous parse result - when the server answers 304 or sends
+back a body whose content fingerprint is unchanged
+
+Entries keep the raw response bytes plus the encoding requests chose, so a
+parser can take either the decoded text (the default) or the bytes, e.g.
+feedparser, which sniffs the XML declaration and BOM itself.
+"""
+
+import hashlib
+import os
+import pickle
+import tempfile
+import time
+import zlib
+from typing import Any, Callable, Dict, Optional
+
+from utils.http_client import HttpClient, get_http_client
+
+# Local disk is enough: losing the cache only costs one full download per URL
+HTTP_CACHE_DIR = os.getenv("HTTP_CACHE_DIR", os.path.join(tempfile.gettempdir(), "fid-http-cache"))
+# Parse results are reused on 304 for this long, then re-parsed from the stored body
+# (parsers compare dates against "today", so results must not live forever)
+HTTP_CACHE_PARSED_MAX_AGE = int(os.getenv("HTTP_CACHE_PARSED_MAX_AGE", str(6 * 3600)))
+
+
+def _entry_path(url: str) -> str:
+    return os.path.join(HTTP_CACHE_DIR, hashlib.sha1(url.encode()).hexdigest() + ".cache")
+
+
+def _load(url: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(_entry_path(url), "rb") as f:
+            entry = pickle.load(f)
+        if "encoding" not in entry:
+            return None  # Written before bodies were stored as bytes
+        entry["body"] = zlib.decompress(entry["body"])
+        return entry
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        print(f"⚠️  Ignoring unreadable HTTP cache entry for {url[:80]}: {str(e)[:50]}")
+        return None
+
+
+def _store(url: str, entry: Dict[str, Any]) -> None:
+    """Write atomically so concurrent readers never see a partial file"""
+    try:
+        os.makedirs(HTTP_CACHE_DIR, exist_ok=True)
+        data = {**entry, "body": zlib.compress(entry["body"])}
+        fd, tmp_path = tempfile.mkstemp(dir=HTTP_CACHE_DIR)
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(data, f)
+        os.replace(tmp_path, _entry_path(url))
+    except Exception as e:
+        print(f"⚠️  Could not write HTTP cache entry for {url[:80]}: {str(e)[:50]}")
+
+
+def fetch_parsed(
+    url: str,
+    parse: Callable[[str], Any],
+    cache_as: str,
+    timeout: float = 15,
+    headers: Optional[Dict[str, str]] = None,
+    client: Optional[HttpClient] = None,
+    raw: bool = False,
+) -> Any:
+    """
+    Conditionally GET a URL and return parse(body)
+
+    On 304 - or a 200 whose body hashes to the stored fingerprint, for
+    servers without validators - the stored parse result for `cache_as` is
+    returned without parsing; if it is missing or older than
+    HTTP_CACHE_PARSED_MAX_AGE the stored body is re-parsed instead.
+
+    Args:
+        url: Page or feed URL
+        parse: Turns the response text (bytes if raw) into the caller's result (must be picklable)
+        cache_as: Name for this parse of the URL (one URL can be parsed several ways)
+        timeout: Request timeout in seconds
+        headers: Extra request headers
+        client: HTTP client to use (defaults to the worker-wide one)
+        raw: Pass parse the undecoded response bytes
+
+    Returns:
+        The parse result
+
+    Raises:
+        requests.RequestException on network errors and non-2xx/304 responses
+    """
+    entry = _load(url)
+
+    request_headers = dict(headers or {})
+    if entry:
+        if entry.get("etag"):
+            request_headers['If-None-Match'] = entry["etag"]
+        if entry.get("last_modified"):
+            request_headers['If-Modified-Since'] = entry["last_modified"]
+
+    response = (client or get_http_client()).get(url, timeout=timeout, headers=request_headers)
+    now = time.time()
+
+    if response.status_code != 304 or not entry:
+        response.raise_for_status()
+        body = response.content
+        content_hash = hashlib.sha1(body).hexdigest()
+        validators = {
+            "etag": response.headers.get('ETag'),
+            "last_modified": response.headers.get('Last-Modified'),
+        }
+        if entry and entry.get("content_hash") == content_hash:
+            # Same bytes as last time - keep the parse results, refresh validators
+            if validators != {k: entry.get(k) for k in validators}:
+                entry.update(validators)
+                _store(url, entry)
+        else:
+            entry = {
+                **validators,
+                "content_hash": content_hash,
+                "body": body,
+                # What response.text decodes with
+                "encoding": response.encoding or response.apparent_encoding,
+                "parsed": {},
+            }
+
+    cached = entry["parsed"].get(cache_as)
+    if cached and now - cached[1] < HTTP_CACHE_PARSED_MAX_AGE:
+        return cached[0]
+
+    body = entry["body"]
+    result = parse(body if raw else body.decode(entry["encoding"] or "utf-8", errors="replace"))
+    entry["parsed"][cache_as] = (result, now)
+    _store(url, entry)
+
+    return result
@@ -0,0 +1,204 @@
+"""
+Shared HTTP Client
+One pooled requests.Session for the whole worker: keep-alive connections per
+host, retries with jittered backoff on 429/5xx, per-task time budgets and
+per-host request metrics
+
+Retries run in HttpClient.request rather than urllib3, so every attempt and
+every backoff sleep counts against the task's budget: a request never runs
+past the deadline, and a Retry-After beyond HTTP_RETRY_AFTER_MAX (or beyond
+the budget left) hands the 429/503 back instead of sleeping on it.
+"""
+
+import os
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+
+# Keep-alive connections kept per host (should cover DETAIL_FETCH_WORKERS x WORKER_CONCURRENCY)
+HTTP_POOL_SIZE = max(1, int(os.getenv("HTTP_POOL_SIZE", "32")))
+# Retries per request on connection errors and RETRY_STATUSES
+HTTP_RETRIES = max(0, int(os.getenv("HTTP_RETRIES", "3")))
+# Backoff before retry n is HTTP_BACKOFF_FACTOR * 2^(n-1) plus up to HTTP_BACKOFF_JITTER seconds
+HTTP_BACKOFF_FACTOR = float(os.getenv("HTTP_BACKOFF_FACTOR", "0.5"))
+HTTP_BACKOFF_JITTER = float(os.getenv("HTTP_BACKOFF_JITTER", "0.5"))
+HTTP_BACKOFF_MAX = float(os.getenv("HTTP_BACKOFF_MAX", "10"))
+# Longest Retry-After honoured; a longer one ends the retries
+HTTP_RETRY_AFTER_MAX = float(os.getenv("HTTP_RETRY_AFTER_MAX", "30"))
+# Total seconds of HTTP one task may spend before its remaining requests fail fast
+TASK_TIME_BUDGET = float(os.getenv("TASK_TIME_BUDGET", "600"))
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+RETRY_METHODS = frozenset({"GET", "HEAD"})
+
+
+class TaskBudgetExceeded(requests.RequestException):
+    """The task's HTTP time budget ran out"""
+
+
+class HostMetrics:
+    """Thread-safe request counters per host"""
+
+    FIELDS = ("requests", "errors", "retries", "not_modified", "seconds")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._hosts: Dict[str, Dict[str, float]] = {}
+
+    def record(self, host: str, seconds: float, status: Optional[int], retries: int) -> None:
+        with self._lock:
+            stats = self._hosts.setdefault(host, dict.fromkeys(self.FIELDS, 0))
+            stats["requests"] += 1
+            stats["retries"] += retries
+            stats["seconds"] += seconds
+            if status is None or status >= 400:
+                stats["errors"] += 1
+            elif status == 304:
+                stats["not_modified"] += 1
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {host: dict(stats) for host, stats in self._hosts.items()}
+
+    def summary(self) -> str:
+        """One line per host, for task logs"""
+        return "\n".join(
+            f"{host}: {int(s['requests'])} requests, {int(s['not_modified'])} not modified, "
+            f"{int(s['errors'])} errors, {int(s['retries'])} retries, {s['seconds']:.1f}s"
+            for host, s in sorted(self.snapshot().items())
+        )
+
+
+def _retry_after(response: requests.Response) -> Optional[float]:
+    """Seconds the server asked us to wait (delta-seconds or HTTP-date), if any"""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def _backoff(retry: int) -> float:
+    """Sleep before retry n (1-based)"""
+    delay = HTTP_BACKOFF_FACTOR * 2 ** (retry - 1) + random.uniform(0, HTTP_BACKOFF_JITTER)
+    return min(delay, HTTP_BACKOFF_MAX)
+
+
+def _build_session() -> requests.Session:
+    # No urllib3 retries: HttpClient.request retries within the task budget
+    adapter = HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE, max_retries=0)
+
+    session = requests.Session()
+    session.headers['User-Agent'] = USER_AGENT
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+# Worker-wide counters; every HttpClient also records into these
+worker_metrics = HostMetrics()
+
+
+class HttpClient:
+    """
+    Handle on the shared session, optionally bound to a task deadline
+
+    Extractors receive one of these instead of calling requests directly;
+    requests made through it share connections, retry policy and metrics.
+    """
+
+    def __init__(self, session: requests.Session, deadline: Optional[float] = None):
+        self._session = session
+        self._deadline = deadline
+        self.metrics = HostMetrics()
+
+    def for_task(self, budget: float = TASK_TIME_BUDGET) -> "HttpClient":
+        """A client on the same session whose requests must finish within budget seconds"""
+        return HttpClient(self._session, time.monotonic() + budget)
+
+    def _remaining(self) -> Optional[float]:
+        return None if self._deadline is None else self._deadline - time.monotonic()
+
+    def request(self, method: str, url: str, timeout: float = 15, **kwargs) -> requests.Response:
+        """
+        Send with up to HTTP_RETRIES retries (GET/HEAD only) on connection
+        errors, timeouts and RETRY_STATUSES; the last 429/5xx is returned,
+        not raised. Each attempt's timeout and each backoff are cut to the
+        task budget left.
+        """
+        host = urlparse(url).netloc.lower()
+        retryable = method.upper() in RETRY_METHODS
+        started = time.monotonic()
+        status = None
+        retries = 0
+        try:
+            while True:
+                remaining = self._remaining()
+                if remaining is not None and remaining <= 0:
+                    raise TaskBudgetExceeded(f"Task HTTP budget exhausted before {url[:80]}")
+                attempt_timeout = timeout if remaining is None else min(timeout, remaining)
+
+                status = None
+                try:
+                    response = self._session.request(method, url, timeout=attempt_timeout, **kwargs)
+                except (requests.ConnectionError, requests.Timeout):
+                    if not retryable or retries >= HTTP_RETRIES:
+                        raise
+                    delay = _backoff(retries + 1)
+                    remaining = self._remaining()
+                    if remaining is not None and delay >= remaining:
+                        raise
+                else:
+                    status = response.status_code
+                    if not retryable or status not in RETRY_STATUSES or retries >= HTTP_RETRIES:
+                        return response
+                    retry_after = _retry_after(response)
+                    if retry_after is not None and retry_after > HTTP_RETRY_AFTER_MAX:
+                        return response
+                    delay = max(_backoff(retries + 1), retry_after or 0)
+                    remaining = self._remaining()
+                    if remaining is not None and delay >= remaining:
+                        return response
+                    response.close()
+
+                retries += 1
+                time.sleep(delay)
+        finally:
+            elapsed = time.monotonic() - started
+            self.metrics.record(host, elapsed, status, retries)
+            if self.metrics is not worker_metrics:
+                worker_metrics.record(host, elapsed, status, retries)
+
+    def get(self, url: str, timeout: float = 15, **kwargs) -> requests.Response:
+        return self.request("GET", url, timeout=timeout, **kwargs)
+
+    def head(self, url: str, timeout: float = 15, **kwargs) -> requests.Response:
+        return self.request("HEAD", url, timeout=timeout, **kwargs)
+
+
+_default_client: Optional[HttpClient] = None
+_default_lock = threading.Lock()
+
+
+def get_http_client() -> HttpClient:
+    """The worker-wide client (no deadline), created on first use"""
+    global _default_client
+    with _default_lock:
+        if _default_client is None:
+            _default_client = HttpClient(_build_session())
+            _default_client.metrics = worker_metrics
+        return _default_client
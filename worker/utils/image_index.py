@@ -0,0 +1,65 @@
+"""
+Image Dedup Index
+Redis hashes mapping source URL -> content hash -> stored image (Supabase URL
+plus variant set), so known images cost no network calls and identical bytes
+are stored once
+"""
+
+import hashlib
+import json
+import os
+from typing import Any, Dict, Optional
+
+import redis
+
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379")
+
+IMAGE_INDEX_URLS_KEY = "image_index:urls"        # source URL -> content hash
+IMAGE_INDEX_CONTENT_KEY = "image_index:content"  # content hash -> stored image JSON
+
+redis_client = redis.from_url(REDIS_URL, decode_responses=True)
+
+
+def content_hash(data: bytes) -> str:
+    """Content address of an image (sha256 hex)"""
+    return hashlib.sha256(data).hexdigest()
+
+
+def _decode(value: Optional[str]) -> Optional[Dict[str, Any]]:
+    if not value:
+        return None
+    if not value.startswith("{"):
+        # Entry written before variants existed - a bare URL
+        return {"url": value, "variants": None}
+    return json.loads(value)
+
+
+def lookup_source_url(image_url: str) -> Optional[Dict[str, Any]]:
+    """Stored image ({"url", "variants"}) for an already-mirrored source URL, or None"""
+    try:
+        digest = redis_client.hget(IMAGE_INDEX_URLS_KEY, image_url)
+        if digest:
+            return _decode(redis_client.hget(IMAGE_INDEX_CONTENT_KEY, digest))
+    except redis.RedisError as e:
+        print(f"⚠️  Image index lookup failed: {str(e)[:50]}")
+    return None
+
+
+def lookup_content(digest: str) -> Optional[Dict[str, Any]]:
+    """Stored image for bytes with this content hash, or None"""
+    try:
+        return _decode(redis_client.hget(IMAGE_INDEX_CONTENT_KEY, digest))
+    except redis.RedisError as e:
+        print(f"⚠️  Image index lookup failed: {str(e)[:50]}")
+        return None
+
+
+def record(image_url: str, digest: str, stored: Dict[str, Any]) -> None:
+    """Remember that image_url has content digest, stored as `stored`"""
+    try:
+        pipe = redis_client.pipeline()
+        pipe.hset(IMAGE_INDEX_CONTENT_KEY, digest, json.dumps(stored))
+        pipe.hset(IMAGE_INDEX_URLS_KEY, image_url, digest)
+        pipe.execute()
+    except redis.RedisError as e:
+        print(f"⚠️  Could not update image index: {str(e)[:50]}")
@@ -0,0 +1,44 @@
+"""
+Image Ingestion Queue
+Events are saved with their source image URL; jobs on this Redis list mirror
+the image to Supabase Storage afterwards and swap the stored URL
+"""
+
+import json
+import os
+from typing import Dict, List, Optional
+
+from utils.image_uploader import SUPABASE_URL, supabase
+
+IMAGE_QUEUE = "image_queue"
+
+# Images downloaded/uploaded at once by one worker process (independent of WORKER_CONCURRENCY)
+IMAGE_WORKER_CONCURRENCY = max(1, int(os.getenv("IMAGE_WORKER_CONCURRENCY", "4")))
+
+
+def needs_mirroring(image_url: Optional[str]) -> bool:
+    """True if the image is external and Supabase Storage is configured"""
+    if not image_url or not supabase:
+        return False
+    return not (SUPABASE_URL and SUPABASE_URL in image_url)
+
+
+def enqueue_image_jobs(redis_client, jobs: List[Dict]) -> int:
+    """
+    Queue image jobs ({"fid_hash", "image_url"}) for the image stage
+
+    Returns:
+        Number of jobs queued
+    """
+    if not jobs:
+        return 0
+    redis_client.lpush(IMAGE_QUEUE, *[json.dumps(job) for job in jobs])
+    return len(jobs)
+
+
+def pop_image_job(redis_client, timeout: int = 2) -> Optional[Dict]:
+    """Block up to timeout seconds for the next image job"""
+    item = redis_client.brpop(IMAGE_QUEUE, timeout=timeout)
+    if item:
+        return json.loads(item[1])
+    return None
@@ -5,10 +5,13 @@ Downloads external images and saves them to Supabase Storage (persistent)
 
 import requests
 import os
-from typing import Optional
-import hashlib
+from typing import Any, Dict, Optional
 from urllib.parse import urlparse
 
+from utils import image_index
+from utils.http_client import get_http_client
+from utils.image_variants import build_variants
+
 # Try to import Supabase (might not be available in all environments)
 try:
     from supabase import create_client, Client
@@ -42,71 +45,92 @@ else:
         print("⚠️  Supabase credentials not configured - images will not be cached")
 
 
-def download_and_save_image(image_url: str) -> Optional[str]:
+def _upload(filename: str, data: bytes, content_type: str) -> str:
+    """Upload bytes to the events bucket and return the public URL"""
+    supabase.storage.from_('events').upload(
+        filename,
+        data,
+        file_options={"content-type": content_type, "upsert": "true"}
+    )
+    # Clean up URL - remove trailing query string artifacts
+    return supabase.storage.from_('events').get_public_url(filename).rstrip('?')
+
+
+def store_image(image_url: str) -> Optional[Dict[str, Any]]:
     """
     Download an external image and save it to Supabase Storage
     
+    Images are resized and re-encoded into WebP/AVIF width variants under
+    bulk-events/<content hash>/<width>.<format>; the original is only kept
+    when it cannot be decoded or Pillow is unavailable. Results are tracked
+    in the image index, so a known source URL returns without any network
+    call and the same bytes behind different URLs are processed once.
+    
     Args:
         image_url: External image URL (Facebook, Ticketmaster, etc.)
         
     Returns:
-        Supabase public URL or None if upload fails
+        {"url": primary image URL, "variants": {format: {width: URL}} or None},
+        or None if the download/upload fails
     """
     if not image_url or not supabase:
         return None
         
-    try:
-        # Generate unique filename based on URL hash
-        url_hash = hashlib.md5(image_url.encode()).hexdigest()[:12]
-        
-        # Get file extension from URL
-        parsed_url = urlparse(image_url)
-        ext = os.path.splitext(parsed_url.path)[1]
-        
-        if not ext or ext not in ['.jpg', '.jpeg', '.png', '.gif', '.webp']:
-            ext = '.jpg'  # Default to jpg
-            
-        filename = f"bulk-events/{url_hash}{ext}"
-        
-        # Check if already uploaded to Supabase
-        try:
-            existing_url = supabase.storage.from_('events').get_public_url(filename)
-            # Clean up URL - remove trailing query string artifacts
-            existing_url = existing_url.rstrip('?')
-            # Verify it exists
-            check_response = requests.head(existing_url, timeout=5)
-            if check_response.status_code == 200:
-                print(f"✅ Image already in Supabase: {filename}")
-                return existing_url
-        except:
-            pass
+    # Source URL seen before - no network calls at all
+    known = image_index.lookup_source_url(image_url)
+    if known:
+        print(f"✅ Image already in Supabase (indexed)")
+        return known
         
+    try:
         # Download the external image
         print(f"⬇️  Downloading image from: {image_url[:80]}...")
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
-        response = requests.get(image_url, headers=headers, timeout=15, stream=True)
+        response = get_http_client().get(image_url, timeout=15, stream=True)
         response.raise_for_status()
         
         # Get content type
         content_type = response.headers.get('content-type', 'image/jpeg')
         image_data = response.content
+        digest = image_index.content_hash(image_data)
         
-        # Upload to Supabase Storage
-        print(f"☁️  Uploading to Supabase: {filename}")
-        supabase.storage.from_('events').upload(
-            filename,
-            image_data,
-            file_options={"content-type": content_type}
-        )
+        # Same bytes already stored under another source URL
+        stored = image_index.lookup_content(digest)
+        if stored:
+            print(f"✅ Identical image already in Supabase: {stored['url'][:80]}")
+            image_index.record(image_url, digest, stored)
+            return stored
+        
+        # Content-addressed keys - re-uploading the same bytes is harmless
+        key = f"bulk-events/{digest[:32]}"
+        
+        try:
+            variants = build_variants(image_data)
+        except Exception as e:
+            print(f"⚠️  Could not decode image, storing original: {str(e)[:50]}")
+            variants = []
+        
+        if variants:
+            print(f"☁️  Uploading {len(variants)} variants to Supabase: {key}/")
+            variant_urls: Dict[str, Dict[str, str]] = {}
+            for fmt, width, data, variant_type in variants:
+                variant_urls.setdefault(fmt, {})[str(width)] = _upload(f"{key}/{width}.{fmt}", data, variant_type)
+            # Largest variant in the preferred format is the event's main image
+            primary = variant_urls[variants[0][0]]
+            stored = {"url": primary[max(primary, key=int)], "variants": variant_urls}
+        else:
+            # Get file extension from URL
+            parsed_url = urlparse(image_url)
+            ext = os.path.splitext(parsed_url.path)[1]
+            
+            if not ext or ext not in ['.jpg', '.jpeg', '.png', '.gif', '.webp']:
+                ext = '.jpg'  # Default to jpg
+            
+            print(f"☁️  Uploading to Supabase: {key}{ext}")
+            stored = {"url": _upload(f"{key}{ext}", image_data, content_type), "variants": None}
         
-        # Get public URL
-        public_url = supabase.storage.from_('events').get_public_url(filename)
-        # Clean up URL - remove trailing query string artifacts
-        public_url = public_url.rstrip('?')
-        print(f"✅ Image uploaded to Supabase: {public_url[:80]}...")
-        return public_url
+        image_index.record(image_url, digest, stored)
+        print(f"✅ Image uploaded to Supabase: {stored['url'][:80]}...")
+        return stored
         
     except requests.exceptions.Timeout:
         print(f"⏱️  Timeout downloading image: {image_url[:80]}")
@@ -119,6 +143,20 @@ def download_and_save_image(image_url: str) -> Optional[str]:
         return None
 
 
+def download_and_save_image(image_url: str) -> Optional[str]:
+    """
+    Download an external image and save it to Supabase Storage
+    
+    Args:
+        image_url: External image URL (Facebook, Ticketmaster, etc.)
+        
+    Returns:
+        Supabase public URL or None if upload fails
+    """
+    stored = store_image(image_url)
+    return stored["url"] if stored else None
+
+
 def process_event_image(event_data: dict) -> dict:
     """
     Process an event's image_url by downloading it to Supabase Storage if it's external
@@ -0,0 +1,86 @@
+"""
+Image Variants
+Decodes a downloaded image, applies its EXIF orientation, strips metadata and
+encodes width-capped WebP/AVIF variants for responsive images
+"""
+
+import os
+from io import BytesIO
+from typing import List, Tuple
+
+# Pillow is optional - without it images are stored as downloaded
+try:
+    from PIL import Image, ImageOps, features
+    PIL_AVAILABLE = True
+except ImportError:
+    print("⚠️  Pillow not installed - image variants disabled")
+    PIL_AVAILABLE = False
+
+# Variant widths in pixels; the largest is also the dimension cap
+IMAGE_VARIANT_WIDTHS = sorted({
+    int(w) for w in os.getenv("IMAGE_VARIANT_WIDTHS", "480,960,1600").split(",") if w.strip()
+})
+# Output formats, in order of preference for image_url (first supported wins)
+IMAGE_VARIANT_FORMATS = [
+    f.strip().lower() for f in os.getenv("IMAGE_VARIANT_FORMATS", "webp,avif").split(",") if f.strip()
+]
+
+# format -> (Pillow encoder, content type, save options)
+ENCODERS = {
+    "webp": ("WEBP", "image/webp", {"quality": 80, "method": 4}),
+    "avif": ("AVIF", "image/avif", {"quality": 60}),
+}
+
+
+def supported_formats() -> List[str]:
+    """Configured formats this Pillow build can encode"""
+    if not PIL_AVAILABLE:
+        return []
+    return [fmt for fmt in IMAGE_VARIANT_FORMATS if fmt in ENCODERS and features.check(fmt)]
+
+
+def build_variants(data: bytes) -> List[Tuple[str, int, bytes, str]]:
+    """
+    Encode every configured width x format of an image
+
+    Widths larger than the original are skipped (no upscaling); an image
+    narrower than every configured width gets one variant at its own width.
+
+    Args:
+        data: Downloaded image bytes
+
+    Returns:
+        (format, width, encoded bytes, content type) tuples; empty if
+        Pillow or every configured encoder is unavailable
+
+    Raises:
+        Exception if the bytes cannot be decoded as an image
+    """
+    formats = supported_formats()
+    if not formats or not IMAGE_VARIANT_WIDTHS:
+        return []
+
+    with Image.open(BytesIO(data)) as original:
+        original.seek(0)  # First frame of animated GIF/WebP
+        image = ImageOps.exif_transpose(original)
+        image = image.convert("RGBA" if image.mode in ("RGBA", "LA", "P") else "RGB")
+        # Drop EXIF, ICC profile, comments etc. - nothing carries into the encoders
+        image.info = {}
+
+    widths = [w for w in IMAGE_VARIANT_WIDTHS if w < image.width]
+    widths.append(min(image.width, IMAGE_VARIANT_WIDTHS[-1]))
+
+    variants = []
+    for width in sorted(set(widths)):
+        if width == image.width:
+            resized = image
+        else:
+            height = max(1, round(image.height * width / image.width))
+            resized = image.resize((width, height), Image.LANCZOS)
+        for fmt in formats:
+            encoder, content_type, options = ENCODERS[fmt]
+            buffer = BytesIO()
+            resized.save(buffer, format=encoder, **options)
+            variants.append((fmt, width, buffer.getvalue(), content_type))
+
+    return variants
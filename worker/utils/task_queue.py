@@ -0,0 +1,241 @@
+"""
+Reliable Extraction Queue
+Tasks wait in priority lanes (interactive > scheduled > backfill). A claim
+picks a lane by smooth weighted round-robin, so lower lanes are slowed down,
+never starved, and LMOVEs the task into this worker's processing list,
+leased for EXTRACTION_VISIBILITY_TIMEOUT seconds (the move and the lease are
+one Lua script, so a crash can't leave a task unleased). The worker renews
+the leases of its running tasks (extend_leases) and acknowledges (removes) a
+task when it finishes. A task whose worker died past its lease goes back on
+its lane, up to EXTRACTION_MAX_DELIVERIES times, then to the dead-letter
+list.
+
+Producers (api/utils/queue.py) LPUSH to a lane and ring READY_KEY, which idle
+workers block on.
+"""
+
+import hashlib
+import json
+import os
+import socket
+import time
+from typing import Dict, List, Optional, Tuple
+
+EXTRACTION_QUEUE = "extraction_queue"
+
+# Lane -> Redis list (must match api/utils/queue.py). "scheduled" keeps the
+# original key, so tasks queued by older producers still run.
+LANE_KEYS = {
+    "interactive": "extraction_queue:interactive",  # Admin URL extractions - a human is waiting
+    "scheduled": EXTRACTION_QUEUE,                  # Hourly and manual source syncs
+    "backfill": "extraction_queue:backfill",        # Full re-crawls
+}
+LANES = tuple(LANE_KEYS)  # Priority order
+DEFAULT_LANE = "scheduled"
+# Share of claims each lane gets while all of them have work
+LANE_WEIGHTS = {"interactive": 8, "scheduled": 3, "backfill": 1}
+READY_KEY = "extraction_queue:ready"  # Doorbell: one token per push, trimmed
+READY_MAX_TOKENS = 100
+
+PROCESSING_KEY_PREFIX = "extraction_queue:processing:"
+LEASES_KEY = "extraction_queue:leases"          # sorted set: lease -> deadline (epoch seconds)
+DEAD_LETTER_KEY = "extraction_queue:dead"
+
+# Marks the task queued/running for a (source_type, url) - set by the API to
+# coalesce duplicate requests, deleted here when the task finishes (key format
+# must match api/utils/queue.py)
+ACTIVE_TASK_KEY_PREFIX = "extraction_queue:active:"
+
+# Stable per host, so a restarted worker finds what it was processing when it died
+WORKER_ID = os.getenv("WORKER_ID") or socket.gethostname()
+PROCESSING_KEY = PROCESSING_KEY_PREFIX + WORKER_ID
+
+# Longer than any healthy task (TASK_TIME_BUDGET caps a task's HTTP time at 600s by default)
+EXTRACTION_VISIBILITY_TIMEOUT = int(os.getenv("EXTRACTION_VISIBILITY_TIMEOUT", "900"))
+EXTRACTION_MAX_DELIVERIES = max(1, int(os.getenv("EXTRACTION_MAX_DELIVERIES", "3")))
+
+# A claimed task: (task data, lease). The lease identifies the exact queued
+# message, so ack/release/redelivery never touch another copy of it.
+Claim = Tuple[Dict, str]
+
+
+def _lease(processing_key: str, raw: str) -> str:
+    return f"{processing_key}\n{raw}"
+
+
+def _split_lease(lease: str) -> Tuple[str, str]:
+    processing_key, raw = lease.split("\n", 1)
+    return processing_key, raw
+
+
+def lane_key(lane: Optional[str]) -> str:
+    return LANE_KEYS.get(lane or DEFAULT_LANE, EXTRACTION_QUEUE)
+
+
+def _push(pipe, key: str, raw: str, head: bool = False) -> None:
+    """Queue raw on a lane (head = next out) and ring the doorbell"""
+    if head:
+        pipe.rpush(key, raw)  # Claims take from the right
+    else:
+        pipe.lpush(key, raw)
+    pipe.lpush(READY_KEY, 1)
+    pipe.ltrim(READY_KEY, 0, READY_MAX_TOKENS - 1)
+
+
+# Smooth weighted round-robin state (nginx-style); claims come from the main loop only
+_lane_credit = {lane: 0 for lane in LANES}
+
+
+def _lane_order(lanes: Tuple[str, ...]) -> List[str]:
+    """This claim's lane preference: the weighted pick first, then by priority"""
+    total = sum(LANE_WEIGHTS[lane] for lane in lanes)
+    for lane in lanes:
+        _lane_credit[lane] += LANE_WEIGHTS[lane]
+    pick = max(lanes, key=lambda lane: _lane_credit[lane])
+    _lane_credit[pick] -= total
+    return [pick] + [lane for lane in lanes if lane != pick]
+
+
+# KEYS: lane, processing list, leases; ARGV: lease deadline. Member format
+# must match _lease().
+_CLAIM_SCRIPT = """
+local raw = redis.call('LMOVE', KEYS[1], KEYS[2], 'RIGHT', 'LEFT')
+if raw then
+    redis.call('ZADD', KEYS[3], ARGV[1], KEYS[2] .. '\\n' .. raw)
+end
+return raw
+"""
+
+
+def _claim_now(redis_client, lanes: Tuple[str, ...]) -> Optional[Claim]:
+    script = redis_client.register_script(_CLAIM_SCRIPT)  # No round trip: runs by EVALSHA
+    for lane in _lane_order(lanes):
+        raw = script(
+            keys=[LANE_KEYS[lane], PROCESSING_KEY, LEASES_KEY],
+            args=[time.time() + EXTRACTION_VISIBILITY_TIMEOUT],
+        )
+        if raw is not None:
+            return json.loads(raw), _lease(PROCESSING_KEY, raw)
+    return None
+
+
+def clear_active(redis_client, task: Dict) -> None:
+    """The task finished: let the next request for its (source_type, url) queue a new one"""
+    digest = hashlib.sha1(f"{task.get('source_type')}\n{task.get('url')}".encode()).hexdigest()
+    key = ACTIVE_TASK_KEY_PREFIX + digest
+
+    def delete_if_ours(pipe):
+        # Only this task's marker - a newer task may already own the key
+        if pipe.get(key) == str(task.get("task_id")):
+            pipe.multi()
+            pipe.delete(key)
+
+    redis_client.transaction(delete_if_ours, key)
+
+
+def claim(redis_client, timeout: int = 2, lanes: Tuple[str, ...] = LANES) -> Optional[Claim]:
+    """
+    Lease the next task from the given lanes to this worker, blocking up to
+    timeout seconds on the doorbell when they are all empty
+    """
+    claimed = _claim_now(redis_client, lanes)
+    if claimed is None and timeout and redis_client.brpop(READY_KEY, timeout=timeout):
+        claimed = _claim_now(redis_client, lanes)
+    return claimed
+
+
+def ack(redis_client, lease: str) -> None:
+    """The task is finished (done or failed in the DB) - drop it for good"""
+    processing_key, raw = _split_lease(lease)
+    pipe = redis_client.pipeline(transaction=True)
+    pipe.lrem(processing_key, 1, raw)
+    pipe.zrem(LEASES_KEY, lease)
+    pipe.execute()
+
+
+def extend_leases(redis_client, leases: List[str]) -> None:
+    """
+    Heartbeat for running tasks: push their deadlines a full visibility
+    timeout out. A lease already swept (XX) is not brought back.
+    """
+    if not leases:
+        return
+    deadline = time.time() + EXTRACTION_VISIBILITY_TIMEOUT
+    redis_client.zadd(LEASES_KEY, {lease: deadline for lease in leases}, xx=True)
+
+
+def release(redis_client, lease: str) -> None:
+    """Hand an unstarted task back: to the tail of its lane, delivery count unchanged"""
+    processing_key, raw = _split_lease(lease)
+    pipe = redis_client.pipeline(transaction=True)
+    _push(pipe, lane_key(json.loads(raw).get("lane")), raw)
+    pipe.lrem(processing_key, 1, raw)
+    pipe.zrem(LEASES_KEY, lease)
+    pipe.execute()
+
+
+def _redeliver(redis_client, lease: str, reason: str, dead: List[Dict]) -> bool:
+    """
+    Put a lost task back at the head of its lane, or dead-letter it (appended
+    to dead) once it has used up its deliveries
+
+    Returns:
+        False if the message was already gone (acked late, or another
+        worker's sweep got there first)
+    """
+    processing_key, raw = _split_lease(lease)
+    outcome = {}
+
+    def move(pipe):
+        # Runs under WATCH processing_key: the check and the move are atomic
+        outcome.clear()
+        if pipe.lpos(processing_key, raw) is None:
+            pipe.multi()
+            pipe.zrem(LEASES_KEY, lease)
+            return
+        task = json.loads(raw)
+        task["deliveries"] = task.get("deliveries", 1) + 1
+        pipe.multi()
+        pipe.lrem(processing_key, 1, raw)
+        pipe.zrem(LEASES_KEY, lease)
+        if task["deliveries"] > EXTRACTION_MAX_DELIVERIES:
+            task["dead_letter_reason"] = reason
+            task["dead_lettered_at"] = time.time()
+            pipe.lpush(DEAD_LETTER_KEY, json.dumps(task))
+            outcome["dead"] = task
+        else:
+            _push(pipe, lane_key(task.get("lane")), json.dumps(task), head=True)
+        outcome["moved"] = True
+
+    redis_client.transaction(move, processing_key)
+    if "dead" in outcome:
+        dead.append(outcome["dead"])
+    return bool(outcome.get("moved"))
+
+
+def requeue_expired(redis_client) -> Tuple[int, List[Dict]]:
+    """
+    Redeliver every task whose lease has expired (its worker crashed or hung)
+
+    Returns:
+        (number of tasks moved, the ones among them that were dead-lettered)
+    """
+    moved, dead = 0, []
+    reason = f"not acknowledged within {EXTRACTION_VISIBILITY_TIMEOUT}s"
+    for lease in redis_client.zrangebyscore(LEASES_KEY, "-inf", time.time()):
+        moved += _redeliver(redis_client, lease, reason, dead)
+    return moved, dead
+
+
+def recover_own_tasks(redis_client) -> Tuple[int, List[Dict]]:
+    """
+    On startup: anything still in this worker's processing list was in flight
+    when it last stopped - redeliver it now instead of waiting for the lease
+
+    Returns:
+        (number of tasks moved, the ones among them that were dead-lettered)
+    """
+    moved, dead = 0, []
+    for raw in redis_client.lrange(PROCESSING_KEY, 0, -1):
+        moved += _redeliver(redis_client, _lease(PROCESSING_KEY, raw), "worker restarted mid-task", dead)
+    return moved, dead